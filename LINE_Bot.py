@@ -2,7 +2,8 @@ from flask import (
     Flask, 
     request, 
     abort, 
-    render_template
+    render_template,
+    Response
 )
 from linebot.v3 import (
     WebhookHandler
@@ -12,78 +13,272 @@ from linebot.v3.exceptions import (
 )
 from linebot.v3.messaging import (
     Configuration,
-    ApiClient,
-    MessagingApi,
-    ReplyMessageRequest,
     TextMessage,  # 傳輸回Line官方後台的資料格式
+    TemplateMessage,
+    ButtonsTemplate,
+    CarouselTemplate,
+    CarouselColumn,
+    MessageAction,
+    PostbackAction,
+    LocationAction,
+    QuickReply,
+    QuickReplyItem,
 )
 from linebot.v3.webhooks import (
-    MessageEvent,FollowEvent, # 傳輸過來的方法
+    MessageEvent,FollowEvent,PostbackEvent, # 傳輸過來的方法
     TextMessageContent, # 使用者傳過來的資料格式\
+    LocationMessageContent,
 )
-import pandas as pd
 from handle_keys import get_secret_and_token
-from import_modules import *
-from create_linebot_messages_sample import *
-from collections import defaultdict
+from event_queue import BatchDispatcher, EventDispatcher, get_event_user_key
+from line_client import LineClient
+from rest_index import SNAPSHOT_PATH, is_open_at
+from data_loader import RestDataLoader
+from session_store import create_session_store
+from message_cache import MessageCache
+from dedup import EventDeduplicator
+from intent_router import IntentRouter
+from recommender import Recommender
+from rate_limit import ConcurrencyLimiter, TokenBucketLimiter
+import metrics
+import logging
+import os
+from urllib.parse import parse_qsl
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
 app = Flask(__name__)
 keys = get_secret_and_token()
 handler = WebhookHandler(keys['LINEBOT_SECRET_KEY'])
-configuration = Configuration(access_token=keys['LINEBOT_ACCESS_TOKEN'])
+# LINEBOT_API_HOST 只在壓測時指向本機的假 LINE API (fake_line_api.py)，平常不設定
+configuration = Configuration(host=os.environ.get('LINEBOT_API_HOST'), access_token=keys['LINEBOT_ACCESS_TOKEN'])
+line_client = LineClient(
+    configuration,
+    pool_size=int(os.environ.get('LINEBOT_HTTP_POOL_SIZE', 10)),
+    retries=int(os.environ.get('LINEBOT_HTTP_RETRIES', 2))
+)
+
+# 使用者目前選的餐別 (meal key)，LRU + TTL；多 worker 部署時改用 sqlite:///path 共用
+rest_recommand_memory = create_session_store(
+    os.environ.get('LINEBOT_SESSION_STORE', 'memory'),
+    ttl=int(os.environ.get('LINEBOT_SESSION_TTL', 1800)),
+    maxsize=int(os.environ.get('LINEBOT_SESSION_MAXSIZE', 10000))
+)
 
-rest_recommand_memory = dict()
+# LINE 重送的 webhook 以 webhookEventId 去重；多 worker 部署時改用 sqlite:///path 共用
+event_deduplicator = EventDeduplicator(create_session_store(
+    os.environ.get('LINEBOT_DEDUP_STORE', 'memory'),
+    ttl=int(os.environ.get('LINEBOT_DEDUP_WINDOW', 600)),
+    maxsize=int(os.environ.get('LINEBOT_DEDUP_MAXSIZE', 100000)),
+    table='webhook_events'
+))
 
-rest_dict = {
-    'breakfast_rest': pd.read_csv('taichungeatba/breakfast_rest.csv').dropna(axis=1).groupby('區域'),
-    'lunch_rest': pd.read_csv('taichungeatba/lunch_rest.csv').dropna(axis=1).groupby('區域'),
-    'dinner_rest': pd.read_csv('taichungeatba/dinner_rest.csv').dropna(axis=1).groupby('區域')
+# 每個使用者在每個 (餐別, 區域) 會先輪過所有餐廳才重複；游標另外放一個 store，
+# 不佔用 rest_recommand_memory 的容量，也不會和餐別記憶分開被淘汰。預設與 session 用同一種 store
+recommend_cursors = create_session_store(
+    os.environ.get('LINEBOT_RECOMMEND_STORE', os.environ.get('LINEBOT_SESSION_STORE', 'memory')),
+    ttl=int(os.environ.get('LINEBOT_SESSION_TTL', 1800)),
+    maxsize=int(os.environ.get('LINEBOT_RECOMMEND_MAXSIZE', 50000)),
+    table='recommend_cursors'
+)
+recommender = Recommender(recommend_cursors, k=3)
+
+MEAL_COMMANDS = {
+    '#文青早餐': 'breakfast_rest',
+    '#在地午餐': 'lunch_rest',
+    '#高檔晚餐': 'dinner_rest'
 }
 
+# LINEBOT_ASYNC_WORKERS > 0 時，/callback 驗證簽章後先回 200，事件交給背景 worker 回覆
+ASYNC_WORKERS = int(os.environ.get('LINEBOT_ASYNC_WORKERS', 0))
+ASYNC_QUEUE_SIZE = int(os.environ.get('LINEBOT_ASYNC_QUEUE_SIZE', 1000))
+# 同步模式下，一個 webhook 內多個使用者的事件最多同時回覆幾個
+BATCH_CONCURRENCY = int(os.environ.get('LINEBOT_BATCH_CONCURRENCY', 8))
+
+# 每個使用者每秒 LINEBOT_RATE_LIMIT 則、最多連發 LINEBOT_RATE_BURST 則，超過時回覆 (reply) 或略過 (drop)
+user_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('LINEBOT_RATE_LIMIT', 1)),
+    burst=int(os.environ.get('LINEBOT_RATE_BURST', 5))
+)
+RATE_LIMIT_MODE = os.environ.get('LINEBOT_RATE_LIMIT_MODE', 'reply')
+# 同時處理中的 /callback 超過上限直接回 503，0 表示不限制
+webhook_limiter = ConcurrencyLimiter(int(os.environ.get('LINEBOT_MAX_IN_FLIGHT', 0)))
+
+# 固定的選單 / 歡迎訊息只建一次，餐廳資料重新載入時清掉
+message_cache = MessageCache()
+
+# 文字訊息的路由表: 餐別指令以 exact() 註冊，#<區域> 在資料載入時編進同一個 dict
+intent_router = IntentRouter()
+
+def on_rest_data_reload(data):
+    message_cache.invalidate()
+    districts = {section for sections in data.index.values() for section in sections}
+    intent_router.compile(f'#{district}' for district in sorted(districts))
+
+# 餐廳資料啟動時建好，request 時只讀 rest_loader.current；CSV 有更新時在背景重新載入並整份替換
+# (load() 在檔案最後，所有 handler 與路由都註冊完才執行)
+rest_loader = RestDataLoader(
+    snapshot_path=os.environ.get('LINEBOT_REST_SNAPSHOT', SNAPSHOT_PATH),
+    interval=float(os.environ.get('LINEBOT_RELOAD_INTERVAL', 5)),
+    on_reload=on_rest_data_reload
+)
+# 閒聊訊息的搜尋結果分數 (見 SearchIndex.search) 低於這個值就只回 Got it!，
+# 「謝謝」「你好」這類只和某篇評論共用一個詞的訊息不會被當成在找店
+SEARCH_MIN_SCORE = float(os.environ.get('LINEBOT_SEARCH_MIN_SCORE', 0.25))
+
+@app.before_request
+def start_rest_watcher():
+    # 監看 thread 在第一個 request 才啟動 (已啟動時直接返回)；gunicorn preload 的 master 不處理 request，
+    # 不會帶著 thread 去 fork worker
+    rest_loader.start()
+
 @app.route("/callback", methods=['POST'])
 def callback():
+    if not webhook_limiter.try_acquire():
+        app.logger.warning("Too many webhooks in flight, shedding request.")
+        abort(503)
+    try:
+        return process_callback()
+    finally:
+        webhook_limiter.release()
+
+def process_callback():
     # get X-Line-Signature header value
     signature = request.headers['X-Line-Signature']
 
     # get request body as text
     body = request.get_data(as_text=True)
-    app.logger.info("Request body: " + body)
+    if app.logger.isEnabledFor(logging.DEBUG):  # 完整 body 只在 DEBUG 等級記錄
+        app.logger.debug("Request body: %s", body)
 
     # handle webhook body
     try:
-        handler.handle(body, signature)
+        with metrics.timer('linebot_webhook_parse_seconds'):
+            payload = handler.parser.parse(body, signature, as_payload=True)
+        events = event_deduplicator.filter(payload.events)
+        if event_dispatcher is None:
+            batch_dispatcher.dispatch(events)
+        else:
+            for i, event in enumerate(events):
+                if not event_dispatcher.submit(event):
+                    # 佇列滿了就不再等後面的事件 (每個最多等 put_timeout)，整批回 503 讓 LINE 重送；
+                    # 已排入的事件會被去重略過，其餘的從去重表移除，重送時才會處理
+                    rejected = events[i:]
+                    for rejected_event in rejected:
+                        event_deduplicator.forget(rejected_event)
+                    app.logger.warning("Event queue is full, rejected %d event(s).", len(rejected))
+                    abort(503)
     except InvalidSignatureError:
         app.logger.info("Invalid signature. Please check your channel access token/channel secret.")
         abort(400)
 
     return 'OK'
 
+@app.route("/metrics", methods=['GET'])
+def metrics_endpoint():
+    if not metrics.ENABLED:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+metrics.describe('linebot_webhook_parse_seconds', 'Signature verification and webhook body parsing time.')
+metrics.describe('linebot_handler_seconds', 'Time spent in each event handler.')
+metrics.describe('linebot_dataset_lookup_seconds', 'Restaurant index lookup and sampling time.')
+metrics.describe('linebot_reply_seconds', 'LINE Messaging API reply latency.')
+
+def get_registered_handlers():
+    # WebhookHandler 沒有公開查詢已註冊 handler 的 API，只有這裡讀它的私有屬性。
+    # 依 line-bot-sdk 3.26.0 的實作: _handlers 的 key 為 'EventClass' 或 'EventClass_MessageClass'，
+    # _default 為 @handler.default() 註冊的函式；升級 SDK 時要重新確認
+    return handler._handlers, handler._default
+
+def find_event_handler(event):
+    # 與 WebhookHandler.handle 相同的查找順序: Event_Message -> Event -> default
+    handlers, default = get_registered_handlers()
+    func = None
+    if isinstance(event, MessageEvent):
+        func = handlers.get(f'{event.__class__.__name__}_{event.message.__class__.__name__}')
+    if func is None:
+        func = handlers.get(event.__class__.__name__, default)
+    if func is None:
+        app.logger.info("No handler of %s and no default handler", event.__class__.__name__)
+    return func
+
+def build_event_responses(event):
+    # handler 只負責產生回覆訊息，實際送出由 dispatch_event (同步) 或 LINE_Bot_async (非同步) 負責
+    # 沒有來源的事件無法分辨是誰送的，不限流；否則全部會擠在同一個 bucket 互相影響
+    key = get_event_user_key(event)
+    if key and not user_limiter.allow(key):
+        if RATE_LIMIT_MODE == 'drop':
+            return None
+        return [message_cache.get('slow_down', lambda: TextMessage(text="訊息太頻繁了，請稍等一下再試~"))]
+    func = find_event_handler(event)
+    return func(event) if func is not None else None
+
+def dispatch_event(event):
+    responses = build_event_responses(event)
+    if responses:
+        line_client.reply(event.reply_token, responses)
+
+batch_dispatcher = BatchDispatcher(dispatch_event, max_concurrency=BATCH_CONCURRENCY)
+event_dispatcher = EventDispatcher(dispatch_event, workers=ASYNC_WORKERS, maxsize=ASYNC_QUEUE_SIZE) if ASYNC_WORKERS > 0 else None
+
+metrics.register_collector('linebot_session', rest_recommand_memory.stats, counters=rest_recommand_memory.STATS_COUNTERS)
+metrics.register_collector('linebot_recommend_cursors', recommend_cursors.stats, counters=recommend_cursors.STATS_COUNTERS)
+metrics.register_collector('linebot_message_cache', message_cache.stats, counters=message_cache.STATS_COUNTERS)
+metrics.register_collector('linebot_rest_data', rest_loader.stats, counters=rest_loader.STATS_COUNTERS)
+metrics.register_collector('linebot_dedup', event_deduplicator.stats, counters=event_deduplicator.STATS_COUNTERS)
+metrics.register_collector('linebot_rate_limit', user_limiter.stats, counters=user_limiter.STATS_COUNTERS)
+metrics.register_collector('linebot_webhook_in_flight', webhook_limiter.stats, counters=webhook_limiter.STATS_COUNTERS)
+metrics.register_collector('linebot_process', metrics.process_memory)
+if event_dispatcher is None:
+    metrics.register_collector('linebot_batch', batch_dispatcher.stats, counters=batch_dispatcher.STATS_COUNTERS)
+else:
+    metrics.register_collector('linebot_event_queue', event_dispatcher.stats, counters=event_dispatcher.STATS_COUNTERS)
+
 @handler.add(MessageEvent, message=TextMessageContent)
+@metrics.timed('linebot_handler_seconds', handler='handle_message')
 def handle_message(event):
     user_id = event.source.user_id
     user_message = event.message.text # 使用者傳過來的訊息
 
-    if "sample" in user_message:
-        responses = [handle_sample(user_message)]
-    elif '美食推薦' in user_message: # Get Time
-        responses = [handle_choose_time()]
-    elif user_message.startswith('#') and user_message.endswith('餐'): # Get Section
-        responses = [handle_choose_section(user_id, user_message)]
-    elif user_message.startswith('#') and user_message.endswith('區'): # Get recommand
-        section_name = user_message[1:]
-        responses = [handle_rests_recommand(user_id, section_name)]
-    else:# 閒聊
-        responses = [TextMessage(text='Got it!')] 
-    with ApiClient(configuration) as api_client:
-        line_bot_api = MessagingApi(api_client)
-        line_bot_api.reply_message_with_http_info(
-            ReplyMessageRequest(
-                reply_token=event.reply_token,
-                messages=responses
-            )
-        )
+    route = intent_router.route(user_message)
+    return [route(user_id, user_message)]
+
+# 比對順序與原本的 if/elif 相同: sample -> 美食推薦 -> #...餐 -> #...區 -> 閒聊
+# (exact 指令先於 pattern 查詢；這些指令都不含 sample，也只符合自己那一條 pattern，結果與依序比對相同)
+@intent_router.pattern(lambda text: "sample" in text)
+def route_sample(user_id, user_message):
+    return handle_sample(user_message)
 
+@intent_router.exact('美食推薦')
+@intent_router.pattern(lambda text: '美食推薦' in text) # Get Time
+def route_choose_time(user_id, user_message):
+    return handle_choose_time()
+
+@intent_router.exact(*MEAL_COMMANDS)
+@intent_router.pattern(lambda text: text.startswith('#') and text.endswith('餐')) # Get Section
+def route_choose_section(user_id, user_message):
+    return handle_choose_section(user_id, user_message)
+
+@intent_router.pattern(lambda text: text.startswith('#') and text.endswith('區')) # Get recommand
+def route_rests_recommand(user_id, user_message):
+    section_name = user_message[1:]
+    return handle_rests_recommand(user_id, section_name)
+
+@intent_router.fallback # 閒聊，訊息像是在找店時用全文搜尋回覆符合的餐廳
+def route_chat(user_id, user_message):
+    if len(user_message) >= 2:
+        with metrics.timer('linebot_dataset_lookup_seconds', lookup='search'):
+            hits = rest_loader.current.search.search(user_message, k=5, min_score=SEARCH_MIN_SCORE)
+        if hits:
+            return create_rests_carousel([rest for score, rest in hits])
+    return message_cache.get('chat', lambda: TextMessage(text='Got it!'))
+
+@metrics.timed('linebot_handler_seconds', handler='handle_choose_time')
 def handle_choose_time():
+    return message_cache.get('choose_time', create_choose_time_message)
+
+def create_choose_time_message():
     response = ButtonsTemplate(
         thumbnail_image_url='https://i.imgur.com/b9oaYpu.jpeg',
         title='歡迎使用!!',
@@ -100,22 +295,25 @@ def handle_choose_time():
         template=response
     )
 
+@metrics.timed('linebot_handler_seconds', handler='handle_choose_section')
 def handle_choose_section(user_id, time_message):
-    def create_quick_reply_item(section_name):
-        return QuickReplyItem(action=MessageAction(text=f'#{section_name}', label=f'{section_name}'))
+    meal = MEAL_COMMANDS.get(time_message)
+    if meal is None:  # 符合 #...餐 但不是三種餐別之一 (例如 #宵夜餐)，請使用者重新選擇
+        return handle_choose_time()
+    rest_recommand_memory.set(user_id, meal)
+    return get_choose_section_message(meal)
 
-    if time_message == '#文青早餐':
-        rest_groups = rest_dict['breakfast_rest']
-    elif time_message == '#在地午餐':
-        rest_groups = rest_dict['lunch_rest']
-    elif time_message == '#高檔晚餐':
-        rest_groups = rest_dict['dinner_rest']
-    
-    rest_recommand_memory[user_id] = rest_groups
+def get_choose_section_message(meal):
+    return message_cache.get(('choose_section', meal), lambda: create_choose_section_message(meal))
 
+def create_choose_section_message(meal):
+    def create_quick_reply_item(section_name):
+        return QuickReplyItem(action=MessageAction(text=f'#{section_name}', label=f'{section_name}'))
 
-    sections = rest_groups.groups.keys()
+    sections = rest_loader.current.index[meal].keys()
     quick_reply_items = [create_quick_reply_item(section) for section in sections]
+    if rest_loader.current.geo[meal] and len(quick_reply_items) < 13:  # Quick Reply 最多 13 個
+        quick_reply_items.insert(0, QuickReplyItem(action=LocationAction(label='傳送我的位置')))
     quick_reply_body = QuickReply(items=quick_reply_items)
 
     return TextMessage(
@@ -123,36 +321,25 @@ def handle_choose_section(user_id, time_message):
         quickReply=quick_reply_body
     )
 
-def handle_rests_recommand(user_id, section_name):
-    def create_rest_col(rest_text, rest_title, rest_comment="",rest_address="",rest_phon="",rest_url=""):
-#       url = 'https://www.google.com'
-        address = rest_address if rest_address else '這是地址'
-        phon = rest_phon if rest_phon else '這是電話'
-        comment = rest_comment if rest_comment else '這是評論'
-        return CarouselColumn(
-            text=rest_text,
-            title=rest_title,
-            thumbnail_image_url='https://i.imgur.com/97LucO0.jpg',
-            actions=[
-                # MessageAction(label='餐廳地址', text=address),
-                # MessageAction(label='連絡電話', text=phon),
-                # MessageAction(label='餐廳評價', text=comment),
-                PostbackAction(label='餐廳地址', data=f'action=address&info={address}'),
-                PostbackAction(label='連絡電話', data=f'action=phon&info={phon}'),
-                PostbackAction(label='餐廳評價', data=f'action=comment&info={comment}')
-
-            ]
-        )
-    
-    def get_group_sample(group):
-        group_size = len(group)
-        return group.sample(min(group_size, 3))
-
-    rests = rest_recommand_memory[user_id]
-    samples = rests.get_group(section_name).apply(get_group_sample)
+def create_rest_col(rest_text, rest_title, rest_id):
+#   url = 'https://www.google.com'
+    # postback 只帶動作代碼與餐廳 ID，內容由 handle_postback 從索引查出
+    return CarouselColumn(
+        text=rest_text,
+        title=rest_title,
+        thumbnail_image_url='https://i.imgur.com/97LucO0.jpg',
+        actions=[
+            PostbackAction(label='餐廳地址', data=f'a=addr&r={rest_id}'),
+            PostbackAction(label='連絡電話', data=f'a=tel&r={rest_id}'),
+            PostbackAction(label='餐廳評價', data=f'a=cmt&r={rest_id}')
+        ]
+    )
+
+def create_rests_carousel(rests):
+    # 卡片內文不能是空字串，CSV 沒填營業時間時用預設文字
     carousel = CarouselTemplate(columns=[
-        create_rest_col(opentime, name, comment, address,phone)
-        for name, opentime, phone, section, address, comment in samples.values
+        create_rest_col(rest.opentime or '營業時間未提供', rest.name, rest.rest_id)
+        for rest in rests
     ])
     return TemplateMessage(
         type='template',
@@ -160,28 +347,84 @@ def handle_rests_recommand(user_id, section_name):
         template=carousel
     )
 
-from urllib.parse import parse_qsl
+@metrics.timed('linebot_handler_seconds', handler='handle_rests_recommand')
+def handle_rests_recommand(user_id, section_name):
+    meal = rest_recommand_memory.get(user_id)
+    if meal is None:  # 沒選過餐別或 session 已過期
+        return TextMessage(text="請先輸入<美食推薦>選擇想吃的餐廳風格喔~")
+    with metrics.timer('linebot_dataset_lookup_seconds', lookup='section'):
+        data = rest_loader.current
+        rests = data.index[meal].get(section_name)
+        samples = recommender.recommend(user_id, meal, section_name, rests, data.weighted[meal][section_name]) if rests else None
+    if not samples:  # 區域不存在，或重新載入後這個區域已經沒有餐廳
+        return get_choose_section_message(meal)
+    return create_rests_carousel(samples)
+
+@handler.add(MessageEvent, message=LocationMessageContent)
+@metrics.timed('linebot_handler_seconds', handler='handle_location')
+def handle_location(event):
+    user_id = event.source.user_id
+    meal = rest_recommand_memory.get(user_id)
+    if meal is None:
+        response = TextMessage(text="請先輸入<美食推薦>選擇想吃的餐廳風格喔~")
+    else:
+        now = datetime.now(ZoneInfo('Asia/Taipei'))
+        minutes = now.hour * 60 + now.minute
+        with metrics.timer('linebot_dataset_lookup_seconds', lookup='nearest'):
+            nearest = rest_loader.current.geo[meal].nearest(
+                event.message.latitude,
+                event.message.longitude,
+                k=3,
+                predicate=lambda rest: is_open_at(rest, minutes)
+            )
+        if nearest:
+            response = create_rests_carousel([rest for distance, rest in nearest])
+        else:
+            response = TextMessage(text="附近找不到營業中的餐廳，請改用區域選擇~")
+    return [response]
+
 @handler.add(FollowEvent) 
+@metrics.timed('linebot_handler_seconds', handler='handle_follow')
+def handle_follow(event):
+    welcome = message_cache.get('welcome', lambda: TextMessage(text="歡迎加入台中吃飽小幫手!!一起探索台中美味，發現更多好吃的餐廳吧!若要使用尋找美食功能，請輸入關鍵字<美食推薦>"))
+    return [welcome]
+
+# 動作代碼 -> (欄位, 標題, 沒有資料時的預設文字)
+POSTBACK_ACTIONS = {
+    'addr': ('address', '餐廳地址', '這是地址'),
+    'tel': ('phone', '連絡電話', '這是電話'),
+    'cmt': ('comment', '餐廳評價', '這是評論'),
+}
+
+@handler.add(PostbackEvent)
+@metrics.timed('linebot_handler_seconds', handler='handle_postback')
 def handle_postback(event):
-    with ApiClient(configuration) as api_client:
-        line_bot_api = MessagingApi(api_client)
-        line_bot_api.reply_message_with_http_info(
-            ReplyMessageRequest(
-                reply_token=event.reply_token,
-                messages=[TextMessage(text="歡迎加入台中吃飽小幫手!!一起探索台中美味，發現更多好吃的餐廳吧!若要使用尋找美食功能，請輸入關鍵字<美食推薦>")]
-            )
-        )
+    params = dict(parse_qsl(event.postback.data))
+    action = POSTBACK_ACTIONS.get(params.get('a'))
+    rest = rest_loader.current.by_id.get(params.get('r'))
+    if action is None or rest is None:  # 舊版按鈕，或餐廳已從資料中移除
+        return [message_cache.get('postback_missing', lambda: TextMessage(text="找不到這間餐廳的資料，請重新輸入<美食推薦>查詢~"))]
+    return [message_cache.get(('postback', rest.rest_id, params['a']), lambda: create_postback_message(rest, action))]
+
+def create_postback_message(rest, action):
+    field, title, default = action
+    return TextMessage(text=f"{rest.name}\n{title}: {getattr(rest, field) or default}"[:5000])  # TextMessage 最多 5000 字
 
+@metrics.timed('linebot_handler_seconds', handler='handle_sample')
 def handle_sample(user_message):
+    # sample 範例很少用到，第一次用到才載入，不拖慢啟動
+    import create_linebot_messages_sample as samples
     if "按鈕sample" in user_message:
-        return create_buttons_template()
+        return samples.create_buttons_template()
     elif "輪播sample" in user_message:
-        return create_carousel_template()
+        return samples.create_carousel_template()
     elif "確認sample" in user_message:
-        return create_check_template()
+        return samples.create_check_template()
     else:
-        return create_quick_reply()
+        return samples.create_quick_reply()
+
 
+rest_loader.load()
 
 if __name__ == "__main__":
     app.run(debug=True)
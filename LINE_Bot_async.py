@@ -0,0 +1,150 @@
+from quart import (
+    Quart,
+    request,
+    abort,
+    Response
+)
+from linebot.v3.exceptions import (
+    InvalidSignatureError
+)
+from linebot.v3.messaging import (
+    Configuration,
+    AsyncApiClient,
+    AsyncMessagingApi,
+    ReplyMessageRequest,
+)
+import LINE_Bot as bot
+import metrics
+from event_queue import get_event_user_key
+from session_store import MemorySessionStore
+import asyncio
+import logging
+import os
+
+# 非同步版本: 與 LINE_Bot.py 共用同一組 handler 與餐廳資料，只有回覆改用 SDK 的 async client，
+# 等待 LINE API 時不佔用 thread，一個 event loop 可以同時等上千個回覆
+# hypercorn LINE_Bot_async:app
+#
+# 取捨:
+# - /callback 等這批事件都回覆完才回 200，webhook 延遲一定包含一次 LINE API 往返；
+#   要先回 200 再回覆，改用同步版的 LINEBOT_ASYNC_WORKERS
+# - 簽章驗證、解析與 handler 仍在 event loop 上執行 (只有 sqlite store 移到 thread)，CPU 滿載時
+#   同時處理的 request 越多，每個 request 被切得越碎，p99 越差；所以同時處理的 /callback
+#   最多 LINEBOT_ASYNC_CALLBACK_CONCURRENCY 個 (0 表示不限制)，其餘依到達順序排隊。
+#   1 CPU、200 並行、LINE API 50ms 的 bench_servers.py: 不限制 p99 約 2.0~2.4s，限制 64 約 1.2s，吞吐量相同
+app = Quart(__name__)
+
+REPLY_CONCURRENCY = int(os.environ.get('LINEBOT_ASYNC_REPLY_CONCURRENCY', 1000))
+CALLBACK_CONCURRENCY = int(os.environ.get('LINEBOT_ASYNC_CALLBACK_CONCURRENCY', 64))
+
+# 不和 LINE_Bot.configuration 共用: 那份的 retries 是給 urllib3 用的
+async_configuration = Configuration(host=os.environ.get('LINEBOT_API_HOST'), access_token=bot.keys['LINEBOT_ACCESS_TOKEN'])
+async_configuration.connection_pool_maxsize = REPLY_CONCURRENCY
+
+# sqlite 等共用 store 每次存取都有磁碟 I/O，改在 thread 裡執行才不會卡住 event loop；
+# 記憶體 store 只是查 dict，直接在 event loop 上呼叫比切換 thread 快
+def is_blocking(*stores):
+    return not all(isinstance(store, MemorySessionStore) for store in stores)
+
+# handler 會讀寫餐別記憶與推薦游標，只要其中一個不在記憶體，整個 handler 就移到 thread 執行
+BLOCKING_SESSION_STORE = is_blocking(bot.rest_recommand_memory, bot.recommend_cursors)
+BLOCKING_DEDUP_STORE = is_blocking(bot.event_deduplicator.store)
+
+async_api_client = None
+line_bot_api = None
+reply_semaphore = None
+callback_semaphore = None
+
+@app.before_serving
+async def open_line_client():
+    # aiohttp session 必須在 event loop 裡建立
+    global async_api_client, line_bot_api, reply_semaphore, callback_semaphore
+    async_api_client = AsyncApiClient(async_configuration)
+    line_bot_api = AsyncMessagingApi(async_api_client)
+    reply_semaphore = asyncio.Semaphore(REPLY_CONCURRENCY)
+    if CALLBACK_CONCURRENCY > 0:
+        callback_semaphore = asyncio.Semaphore(CALLBACK_CONCURRENCY)
+    # 餐廳資料的監看 thread 也等開始服務才啟動，與 LINE_Bot 相同
+    bot.rest_loader.start()
+
+@app.after_serving
+async def close_line_client():
+    await async_api_client.close()
+
+async def build_event_responses(event):
+    if BLOCKING_SESSION_STORE:
+        return await asyncio.to_thread(bot.build_event_responses, event)
+    return bot.build_event_responses(event)
+
+async def filter_duplicates(events):
+    if BLOCKING_DEDUP_STORE:
+        return await asyncio.to_thread(bot.event_deduplicator.filter, events)
+    return bot.event_deduplicator.filter(events)
+
+async def reply_event(event):
+    responses = await build_event_responses(event)
+    if not responses:
+        return
+    async with reply_semaphore:
+        with metrics.timer('linebot_reply_seconds'):
+            await line_bot_api.reply_message_with_http_info(
+                ReplyMessageRequest(
+                    reply_token=event.reply_token,
+                    messages=responses
+                )
+            )
+
+async def reply_events_in_order(events):
+    # 同一個使用者的事件依序回覆，不同使用者之間同時進行
+    for event in events:
+        try:
+            await reply_event(event)
+        except Exception:
+            app.logger.exception("Failed to handle webhook event")
+
+@app.route("/callback", methods=['POST'])
+async def callback():
+    if not bot.webhook_limiter.try_acquire():
+        app.logger.warning("Too many webhooks in flight, shedding request.")
+        abort(503)
+    try:
+        if callback_semaphore is None:
+            return await process_callback()
+        async with callback_semaphore:  # asyncio.Semaphore 依等待順序放行
+            return await process_callback()
+    finally:
+        bot.webhook_limiter.release()
+
+async def process_callback():
+    # get X-Line-Signature header value
+    signature = request.headers['X-Line-Signature']
+
+    # get request body as text
+    body = await request.get_data(as_text=True)
+    if app.logger.isEnabledFor(logging.DEBUG):
+        app.logger.debug("Request body: %s", body)
+
+    # handle webhook body
+    try:
+        with metrics.timer('linebot_webhook_parse_seconds'):
+            payload = bot.handler.parser.parse(body, signature, as_payload=True)
+    except InvalidSignatureError:
+        app.logger.info("Invalid signature. Please check your channel access token/channel secret.")
+        abort(400)
+
+    chains = {}
+    for event in await filter_duplicates(payload.events):
+        chains.setdefault(get_event_user_key(event), []).append(event)
+    await asyncio.gather(*(reply_events_in_order(chain) for chain in chains.values()))
+
+    return 'OK'
+
+@app.route("/metrics", methods=['GET'])
+async def metrics_endpoint():
+    if not metrics.ENABLED:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
@@ -0,0 +1,60 @@
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+from geo_index import GridIndex, distance_m
+from rest_index import Restaurant
+
+# 以台中附近隨機座標的合成餐廳量測 GridIndex 的建索引時間與每次查詢耗時，並和暴力法逐筆比對結果
+#   python bench_geo.py -n 100000
+LAT_RANGE = (24.0, 24.35)
+LNG_RANGE = (120.45, 120.85)
+
+
+def make_rests(n, rng):
+    for i in range(n):
+        yield Restaurant(f'餐廳{i}', '', '', '', '', '', lat=rng.uniform(*LAT_RANGE), lng=rng.uniform(*LNG_RANGE), rest_id=str(i))
+
+
+def brute_force(rests, lat, lng, k, max_distance):
+    candidates = ((distance_m(lat, lng, rest.lat, rest.lng), rest) for rest in rests)
+    return heapq.nsmallest(k, ((d, rest) for d, rest in candidates if d <= max_distance), key=lambda item: item[0])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the geo grid index against brute force.')
+    parser.add_argument('-n', '--restaurants', type=int, default=100000)
+    parser.add_argument('-q', '--queries', type=int, default=2000)
+    parser.add_argument('-k', type=int, default=3)
+    parser.add_argument('--max-distance', type=float, default=20000)
+    parser.add_argument('--check', type=int, default=200, help='queries to cross-check against brute force')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rests = list(make_rests(args.restaurants, rng))
+
+    started_at = time.perf_counter()
+    index = GridIndex(rests)
+    build_seconds = time.perf_counter() - started_at
+
+    queries = [(rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)) for _ in range(args.queries)]
+    latencies = []
+    for lat, lng in queries:
+        started_at = time.perf_counter()
+        index.nearest(lat, lng, k=args.k, max_distance=args.max_distance)
+        latencies.append(time.perf_counter() - started_at)
+    latencies.sort()
+
+    mismatches = 0
+    for lat, lng in queries[:args.check]:
+        expected = [rest for _, rest in brute_force(rests, lat, lng, args.k, args.max_distance)]
+        actual = [rest for _, rest in index.nearest(lat, lng, k=args.k, max_distance=args.max_distance)]
+        mismatches += expected != actual
+
+    print(f'{len(index)} restaurants, build {build_seconds * 1000:.1f} ms')
+    print(f'query mean {statistics.mean(latencies) * 1000:.3f} ms   '
+          f'p99 {latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000:.3f} ms')
+    print(f'{mismatches} mismatch(es) against brute force in {min(args.check, len(queries))} queries')
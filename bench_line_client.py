@@ -0,0 +1,86 @@
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from linebot.v3.messaging import (
+    ApiClient,
+    Configuration,
+    MessagingApi,
+    ReplyMessageRequest,
+    TextMessage,
+)
+
+from fake_line_api import FakeLineApi, make_self_signed_cert
+from line_client import LineClient
+
+# 對本機自簽 HTTPS 的假 LINE API 送 reply，比較「每次回覆開一個新的 ApiClient」(舊寫法) 與共用連線池的 LineClient
+#   python bench_line_client.py -n 500 --threads 8 --latency 5
+MESSAGES = [TextMessage(text='Got it!')]
+
+
+def make_configuration(fake_api, cert_path):
+    return Configuration(host=fake_api.url, access_token='bench-token', ssl_ca_cert=cert_path)
+
+
+def reply_with_new_client(configuration):
+    def reply(reply_token):
+        with ApiClient(configuration) as api_client:
+            MessagingApi(api_client).reply_message_with_http_info(
+                ReplyMessageRequest(reply_token=reply_token, messages=MESSAGES)
+            )
+    return reply
+
+
+def reply_with_line_client(configuration, pool_size):
+    line_client = LineClient(configuration, pool_size=pool_size)
+
+    def reply(reply_token):
+        line_client.reply(reply_token, MESSAGES)
+    return reply
+
+
+def run(reply, iterations, threads):
+    def timed_reply(i):
+        started_at = time.perf_counter()
+        reply(f'reply-token-{i}')
+        return time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    if threads <= 1:
+        latencies = [timed_reply(i) for i in range(iterations)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = list(executor.map(timed_reply, range(iterations)))
+    elapsed = time.perf_counter() - started_at
+    latencies.sort()
+    return {
+        'replies_per_sec': iterations / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare per-reply ApiClient with the pooled LineClient over local HTTPS.')
+    parser.add_argument('-n', '--iterations', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=1, help='concurrent repliers')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated LINE API latency in ms')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = make_self_signed_cert(directory)
+        fake_api = FakeLineApi(latency=args.latency / 1000, cert_path=cert_path, key_path=key_path).start()
+        clients = {
+            'new ApiClient': reply_with_new_client(make_configuration(fake_api, cert_path)),
+            'LineClient': reply_with_line_client(make_configuration(fake_api, cert_path), pool_size=max(1, args.threads)),
+        }
+        for name, reply in clients.items():
+            run(reply, min(50, args.iterations), args.threads)  # warm-up
+            fake_api.reset()
+            result = run(reply, args.iterations, args.threads)
+            connections = fake_api.stats()['connections']
+            print(f'{name:<14} {result["replies_per_sec"]:8.0f} replies/sec   p50 {result["p50_ms"]:.3f} ms   '
+                  f'p99 {result["p99_ms"]:.3f} ms   {connections} new TLS connection(s)')
+        fake_api.stop()
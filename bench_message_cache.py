@@ -0,0 +1,62 @@
+import argparse
+import os
+import time
+import tracemalloc
+
+# 比較固定選單訊息 (handle_choose_time / handle_choose_section) 走 MessageCache 與每次重新建立的差別:
+# 每次呼叫的耗時、連同序列化成 reply request JSON 的耗時，以及每次呼叫新配置的記憶體
+#   python bench_message_cache.py -n 5000
+os.environ.setdefault('LINEBOT_RELOAD_INTERVAL', '0')
+
+
+def time_per_call(func, iterations):
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started_at) / iterations
+
+
+def allocations_per_call(func, iterations):
+    # 保留每次的回傳值，算出平均每次呼叫新配置且留下來的 bytes 與 block 數
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [func() for _ in range(iterations)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in diff)
+    blocks = sum(stat.count_diff for stat in diff)
+    del results
+    return size / iterations, blocks / iterations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark cached and uncached static menu messages.')
+    parser.add_argument('-n', '--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    import LINE_Bot as bot
+    from linebot.v3.messaging import ReplyMessageRequest
+
+    meal_command, meal = next(iter(bot.MEAL_COMMANDS.items()))
+    cases = {
+        'choose_time': (
+            bot.handle_choose_time,
+            bot.create_choose_time_message,
+        ),
+        'choose_section': (
+            lambda: bot.handle_choose_section('Ubench', meal_command),
+            lambda: bot.create_choose_section_message(meal),
+        ),
+    }
+
+    for name, (cached, uncached) in cases.items():
+        for label, func in (('cached', cached), ('uncached', uncached)):
+            def build_and_serialize():
+                return ReplyMessageRequest(reply_token='bench', messages=[func()]).to_json()
+            func()  # 先填好快取
+            build_seconds = time_per_call(func, args.iterations)
+            reply_seconds = time_per_call(build_and_serialize, args.iterations)
+            size, blocks = allocations_per_call(func, min(1000, args.iterations))
+            print(f'{name:<16} {label:<9} build {build_seconds * 1e6:8.1f} us   build+serialize {reply_seconds * 1e6:8.1f} us   '
+                  f'{size:9.0f} B / {blocks:6.1f} blocks allocated per call')
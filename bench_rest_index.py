@@ -0,0 +1,81 @@
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from rest_index import SECTION_COLUMN, build_rest_index, expand_by_rating
+from recommender import Recommender
+from session_store import MemorySessionStore
+
+# 比較原本 pandas groupby + get_group().apply() 的推薦流程與預先建好的 rest_index
+# 以合成 CSV 量測載入時間與每次推薦 (查區域 + 抽 3 間) 的耗時，需要另外安裝 pandas
+#   python bench_rest_index.py --rows 5000 --sections 29
+COLUMNS = ['name', 'opentime', 'phone', SECTION_COLUMN, 'address', 'comment']
+
+
+def write_csv(path, rows, sections, rng):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            section = rng.choice(sections)
+            writer.writerow([f'餐廳{i}', '07:00-14:00', f'04-2{i:07d}', section, f'台中市{section}路{i}號', '好吃'])
+
+
+def time_per_call(func, iterations):
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started_at) / iterations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark pandas groupby/apply against the precomputed restaurant index.')
+    parser.add_argument('--rows', type=int, default=5000, help='restaurants per meal CSV')
+    parser.add_argument('--sections', type=int, default=29, help='distinct districts')
+    parser.add_argument('-n', '--iterations', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    rng = random.Random(args.seed)
+    sections = [f'區域{i:02d}區' for i in range(args.sections)]
+    with tempfile.TemporaryDirectory() as directory:
+        rest_files = {}
+        for meal in ('breakfast_rest', 'lunch_rest', 'dinner_rest'):
+            rest_files[meal] = os.path.join(directory, f'{meal}.csv')
+            write_csv(rest_files[meal], args.rows, sections, rng)
+        coords_path = os.path.join(directory, 'rest_coords.csv')
+
+        started_at = time.perf_counter()
+        rest_dict = {meal: pd.read_csv(path).dropna(axis=1).groupby(SECTION_COLUMN) for meal, path in rest_files.items()}
+        pandas_load = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        index = build_rest_index(rest_files, coords_path)
+        weighted = {meal: {section: expand_by_rating(rests) for section, rests in groups.items()} for meal, groups in index.items()}
+        index_load = time.perf_counter() - started_at
+
+    def get_group_sample(group):
+        return group.sample(min(len(group), 3))
+
+    def pandas_recommend():
+        # 與原本 handle_rests_recommand 相同的寫法
+        samples = rest_dict['lunch_rest'].get_group(rng.choice(sections)).apply(get_group_sample)
+        return list(samples.values)
+
+    recommender = Recommender(MemorySessionStore(), k=3)
+
+    def index_recommend():
+        section = rng.choice(sections)
+        return recommender.recommend('Ubench', 'lunch_rest', section, index['lunch_rest'][section], weighted['lunch_rest'][section])
+
+    pandas_seconds = time_per_call(pandas_recommend, args.iterations)
+    index_seconds = time_per_call(index_recommend, args.iterations)
+
+    print(f'{args.rows} restaurants x 3 meals, {args.sections} districts')
+    print(f'load       pandas {pandas_load * 1000:9.1f} ms   rest_index {index_load * 1000:9.1f} ms')
+    print(f'recommend  pandas {pandas_seconds * 1e6:9.1f} us   rest_index {index_seconds * 1e6:9.1f} us   ({pandas_seconds / index_seconds:.0f}x)')
@@ -0,0 +1,73 @@
+import argparse
+import functools
+import os
+import random
+import time
+
+# 以接近實際流量的訊息組合，比較 IntentRouter (已編譯 / 未編譯) 與原本 handle_message 的 if/elif 鏈
+# 只量路由本身，不呼叫 handler；順便確認三種方式的路由結果完全相同
+#   python bench_router.py -n 200000
+os.environ.setdefault('LINEBOT_RELOAD_INTERVAL', '0')
+
+CHAT_MESSAGES = ['你好', '謝謝', '請問有素食嗎', '今天天氣不錯', '哈哈', 'ok', '有推薦的牛肉麵嗎', '早安']
+
+
+def message_mix(bot, rng):
+    # [(權重, 產生訊息的函式)]
+    districts = sorted({district for sections in bot.rest_loader.current.index.values() for district in sections})
+    return [
+        (30, lambda: f'#{rng.choice(districts)}'),
+        (20, lambda: rng.choice(list(bot.MEAL_COMMANDS))),
+        (20, lambda: '美食推薦'),
+        (25, lambda: rng.choice(CHAT_MESSAGES)),
+        (5, lambda: rng.choice(['按鈕sample', '輪播sample', '確認sample', 'sample'])),
+    ]
+
+
+def legacy_route(bot, user_message):
+    # 原本 handle_message 的判斷順序
+    if "sample" in user_message:
+        return bot.route_sample
+    elif '美食推薦' in user_message:
+        return bot.route_choose_time
+    elif user_message.startswith('#') and user_message.endswith('餐'):
+        return bot.route_choose_section
+    elif user_message.startswith('#') and user_message.endswith('區'):
+        return bot.route_rests_recommand
+    else:
+        return bot.route_chat
+
+
+def time_per_message(route, messages):
+    started_at = time.perf_counter()
+    for message in messages:
+        route(message)
+    return (time.perf_counter() - started_at) / len(messages)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark intent routing over a realistic message mix.')
+    parser.add_argument('-n', '--messages', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import LINE_Bot as bot
+
+    rng = random.Random(args.seed)
+    mix = message_mix(bot, rng)
+    weights = [weight for weight, _ in mix]
+    messages = [make() for _, make in rng.choices(mix, weights=weights, k=args.messages)]
+
+    router = bot.intent_router
+    compiled = {message: router.route(message) for message in set(messages)}
+    mismatches = sum(compiled[message] is not legacy_route(bot, message) for message in compiled)
+
+    results = {'if/elif chain': time_per_message(functools.partial(legacy_route, bot), messages)}
+    results['IntentRouter (compiled)'] = time_per_message(router.route, messages)
+    router.compile(())
+    results['IntentRouter (uncompiled)'] = time_per_message(router.route, messages)
+    bot.on_rest_data_reload(bot.rest_loader.current)
+
+    print(f'{args.messages} messages, {len(compiled)} distinct, {mismatches} routing mismatch(es) against the if/elif chain')
+    for name, seconds in results.items():
+        print(f'{name:<26} {seconds * 1e9:8.0f} ns/message')
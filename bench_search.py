@@ -0,0 +1,48 @@
+import argparse
+import random
+import resource
+import time
+
+from bench_webhook import percentile
+from rest_index import Restaurant
+from search_index import SearchIndex
+
+# 以合成的餐廳資料量測全文搜尋的建索引時間、記憶體與每次查詢耗時 (平均與 p99)
+#   python bench_search.py -n 1000000
+NAME_CHARS = '老王記阿嬤家小吃麵館牛肉湯包早餐店咖啡廳鍋燒意麵滷肉飯火鍋燒烤壽司拉麵甜點豆花冰品'
+COMMENT_WORDS = ['好吃', '便宜', '份量大', '服務親切', '環境乾淨', '排隊名店', '湯頭濃郁', '肉質軟嫩', '甜而不膩', '停車方便', 'CP值高', '必點']
+
+
+def make_rests(n, rng):
+    for i in range(n):
+        name = ''.join(rng.choice(NAME_CHARS) for _ in range(rng.randint(3, 6)))
+        comment = '，'.join(rng.sample(COMMENT_WORDS, rng.randint(1, 4)))
+        yield Restaurant(name, '', '', '', '', comment, rest_id=str(i))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the restaurant full-text search index.')
+    parser.add_argument('-n', '--restaurants', type=int, default=1000000)
+    parser.add_argument('-q', '--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rests = list(make_rests(args.restaurants, rng))
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started_at = time.perf_counter()
+    index = SearchIndex(rests)
+    build_seconds = time.perf_counter() - started_at
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    queries = [rng.choice(COMMENT_WORDS) if rng.random() < 0.5 else ''.join(rng.sample(NAME_CHARS, 2)) for _ in range(args.queries)]
+    query_seconds = []
+    for query in queries:
+        started_at = time.perf_counter()
+        index.search(query, k=5)
+        query_seconds.append(time.perf_counter() - started_at)
+
+    print(f'{len(index)} restaurants, {index.token_count} tokens')
+    print(f'build {build_seconds:.2f}s, peak RSS +{(rss_after - rss_before) / 1024:.0f} MiB')
+    print(f'query mean {sum(query_seconds) / len(query_seconds) * 1000:.3f} ms, p99 {percentile(query_seconds, 0.99) * 1000:.3f} ms')
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from bench_webhook import WebhookBodyFactory, percentile
+from fake_line_api import FakeLineApi
+
+# 壓測: 本機假 LINE API + 真的 server process，比較同步 (gunicorn gthread + LINE_Bot) 與非同步 (hypercorn + LINE_Bot_async)
+# 的 /callback 吞吐量與 p99。在部署目錄 (有 handle_keys.py 與 taichungeatba/) 下執行:
+#   python bench_servers.py --concurrency 200 --latency 50
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVERS = {
+    'sync': lambda bind, args: [
+        sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_DIR, 'gunicorn_conf.py'), 'LINE_Bot:app',
+    ],
+    'async': lambda bind, args: [
+        sys.executable, '-m', 'hypercorn', 'LINE_Bot_async:app', '--bind', bind, '--workers', str(args.workers),
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(name, fake_api, args):
+    bind = f'127.0.0.1:{free_port()}'
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': os.pathsep.join([os.getcwd(), REPO_DIR, env.get('PYTHONPATH', '')]),
+        'LINEBOT_API_HOST': fake_api.url,
+        'LINEBOT_BIND': bind,
+        'LINEBOT_WORKERS': str(args.workers),
+        'LINEBOT_THREADS': str(args.threads),
+    })
+    process = subprocess.Popen(SERVERS[name](bind, args), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return process, f'http://{bind}/callback'
+
+
+async def post(session, url, factory, make_event):
+    body, signature = factory.body([make_event()])
+    started_at = time.perf_counter()
+    async with session.post(url, data=body.encode('utf-8'), headers={
+        'X-Line-Signature': signature,
+        'Content-Type': 'application/json',
+    }) as response:
+        await response.read()
+        return response.status, time.perf_counter() - started_at
+
+
+async def wait_until_ready(url, factory, process, timeout):
+    deadline = time.perf_counter() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f'server exited with {process.returncode}')
+            try:
+                body, signature = factory.body([])
+                async with session.post(url, data=body.encode('utf-8'), headers={'X-Line-Signature': signature}) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError('server did not become ready')
+
+
+async def load(url, factory, args):
+    seq = 0
+
+    def make_event():
+        nonlocal seq
+        seq += 1
+        return factory.text_event(f'Ubench{seq % args.users:028d}', args.text)
+
+    latencies = []
+    errors = 0
+
+    async def client(session, count):
+        nonlocal errors
+        for _ in range(count):
+            try:
+                status, latency = await post(session, url, factory, make_event)
+            except aiohttp.ClientError:
+                errors += 1
+                continue
+            if status != 200:
+                errors += 1
+            latencies.append(latency)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        per_client = max(1, args.requests // args.concurrency)
+        started_at = time.perf_counter()
+        await asyncio.gather(*(client(session, per_client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started_at
+    return {
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'errors': errors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load-test the sync and async servers against a local fake LINE API.')
+    parser.add_argument('--servers', nargs='*', default=list(SERVERS), choices=list(SERVERS))
+    parser.add_argument('-n', '--requests', type=int, default=4000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=50.0, help='simulated LINE API latency in ms')
+    parser.add_argument('--workers', type=int, default=1, help='server processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads per gunicorn worker (sync only)')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--text', default='美食推薦', help='text message sent in every webhook')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from handle_keys import get_secret_and_token
+
+    factory = WebhookBodyFactory(get_secret_and_token()['LINEBOT_SECRET_KEY'])
+    fake_api = FakeLineApi(latency=args.latency / 1000).start()
+    for name in args.servers:
+        process, url = start_server(name, fake_api, args)
+        try:
+            asyncio.run(wait_until_ready(url, factory, process, args.timeout))
+            fake_api.reset()
+            result = asyncio.run(load(url, factory, args))
+            replies = fake_api.stats()['replies']
+        finally:
+            process.terminate()
+            process.wait()
+        print(f'{name:<6} {result["requests_per_sec"]:8.0f} req/sec   p50 {result["p50_ms"]:8.1f} ms   '
+              f'p99 {result["p99_ms"]:8.1f} ms   {result["errors"]} error(s)   {replies} replies at the fake API')
+    fake_api.stop()
@@ -0,0 +1,106 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# 量測冷啟動: python -X importtime 的 import 耗時排行，以及從啟動 process 到 /callback 第一次回 200 的時間
+# 在部署目錄 (有 handle_keys.py 與 taichungeatba/) 下執行；有 snapshot 時會同時量 snapshot 與 CSV 兩種載入方式
+#   python build_snapshot.py && python bench_startup.py --runs 5
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVE = 'import LINE_Bot; from werkzeug.serving import run_simple; run_simple("127.0.0.1", {port}, LINE_Bot.app)'
+
+
+def child_env(snapshot):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd(), REPO_DIR, env.get('PYTHONPATH', '')])
+    env['LINEBOT_RELOAD_INTERVAL'] = '0'
+    if not snapshot:
+        env['LINEBOT_REST_SNAPSHOT'] = ''  # 空字串: 不用 snapshot，直接讀 CSV
+    return env
+
+
+def import_times(snapshot, top):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import LINE_Bot'],
+        env=child_env(snapshot), capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    total = next(cumulative for cumulative, _, name in rows if name.strip() == 'LINE_Bot')
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def signed_empty_webhook(channel_secret):
+    body = b'{"destination": "Ubench", "events": []}'
+    signature = base64.b64encode(hmac.new(channel_secret.encode('utf-8'), body, hashlib.sha256).digest()).decode('utf-8')
+    return body, signature
+
+
+def time_to_first_200(snapshot, body, signature, timeout):
+    port = free_port()
+    started_at = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVE.format(port=port)],
+        env=child_env(snapshot), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started_at < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f'server exited with {process.returncode}')
+            request = urllib.request.Request(f'http://127.0.0.1:{port}/callback', data=body, headers={
+                'X-Line-Signature': signature,
+                'Content-Type': 'application/json',
+            })
+            try:
+                with urllib.request.urlopen(request, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started_at
+            except (ConnectionError, urllib.error.URLError):
+                time.sleep(0.005)
+        raise RuntimeError('server did not answer within the timeout')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure LINE_Bot import time and time to the first 200 on /callback.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    sys.path[:0] = [os.getcwd(), REPO_DIR]
+    from handle_keys import get_secret_and_token
+    from rest_index import SNAPSHOT_PATH
+
+    body, signature = signed_empty_webhook(get_secret_and_token()['LINEBOT_SECRET_KEY'])
+    modes = {'csv': False}
+    if os.path.exists(os.environ.get('LINEBOT_REST_SNAPSHOT', SNAPSHOT_PATH)):
+        modes['snapshot'] = True
+
+    for name, snapshot in modes.items():
+        total, slowest = import_times(snapshot, args.top)
+        times = [time_to_first_200(snapshot, body, signature, args.timeout) for _ in range(args.runs)]
+        print(f'[{name}] import LINE_Bot {total / 1000:.1f} ms   '
+              f'first 200 median {statistics.median(times) * 1000:.1f} ms (min {min(times) * 1000:.1f}, max {max(times) * 1000:.1f})')
+        for cumulative, self_us, module in slowest:
+            print(f'    {cumulative / 1000:8.1f} ms cumulative {self_us / 1000:8.1f} ms self  {module}')
@@ -0,0 +1,191 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import sys
+import time
+
+# 用簽好章的 webhook body 打 Flask test client，量測每個流程的 events/sec 與各階段耗時
+# LINE API 的 reply 以 stub 取代，不會真的送出；可用 --reply-latency 模擬網路延遲
+#   python bench_webhook.py --save baseline
+#   python bench_webhook.py --compare baseline   # 任一流程變慢超過 --max-regression 時 exit 1
+BENCH_DIR = '.benchmarks'
+
+# 必須在 import LINE_Bot 之前設定: 開啟 metrics、關掉背景 reload 與 rate limit
+os.environ.setdefault('LINEBOT_METRICS', '1')
+os.environ.setdefault('LINEBOT_RELOAD_INTERVAL', '0')
+os.environ.setdefault('LINEBOT_RATE_LIMIT', '1000000000')
+os.environ.setdefault('LINEBOT_RATE_BURST', '1000000000')
+
+
+class WebhookBodyFactory:
+    def __init__(self, channel_secret):
+        self.channel_secret = channel_secret.encode('utf-8')
+        self._seq = 0
+
+    def sign(self, body):
+        digest = hmac.new(self.channel_secret, body.encode('utf-8'), hashlib.sha256).digest()
+        return base64.b64encode(digest).decode('utf-8')
+
+    def _base_event(self, event_type, user_id):
+        self._seq += 1
+        return {
+            'type': event_type,
+            'mode': 'active',
+            'timestamp': int(time.time() * 1000),
+            'source': {'type': 'user', 'userId': user_id},
+            'webhookEventId': f'BENCH{self._seq:020d}',
+            'deliveryContext': {'isRedelivery': False},
+            'replyToken': f'reply-token-{self._seq}',
+        }
+
+    def text_event(self, user_id, text):
+        event = self._base_event('message', user_id)
+        event['message'] = {'type': 'text', 'id': str(self._seq), 'quoteToken': f'q{self._seq}', 'text': text}
+        return event
+
+    def follow_event(self, user_id):
+        event = self._base_event('follow', user_id)
+        event['follow'] = {'isUnblocked': False}
+        return event
+
+    def body(self, events):
+        body = json.dumps({'destination': 'Ubench', 'events': events}, ensure_ascii=False)
+        return body, self.sign(body)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def stub_reply(latency):
+    from linebot.v3.messaging import MessagingApi
+
+    def reply_message_with_http_info(self, reply_message_request, **kwargs):
+        if latency:
+            time.sleep(latency)
+        return None
+    MessagingApi.reply_message_with_http_info = reply_message_with_http_info
+
+
+def build_flows(bot, factory, users):
+    meal_command = next(iter(bot.MEAL_COMMANDS))
+    meal = bot.MEAL_COMMANDS[meal_command]
+    district = next(iter(bot.rest_loader.current.index[meal]))
+    flows = {
+        'follow': lambda user_id: factory.follow_event(user_id),
+        'choose_time': lambda user_id: factory.text_event(user_id, '美食推薦'),
+        'choose_meal': lambda user_id: factory.text_event(user_id, meal_command),
+        'recommend': lambda user_id: factory.text_event(user_id, f'#{district}'),
+        'chat': lambda user_id: factory.text_event(user_id, '你好'),
+    }
+    try:
+        import create_linebot_messages_sample  # noqa: F401
+        flows['sample'] = lambda user_id: factory.text_event(user_id, '按鈕sample')
+    except ImportError:
+        print('create_linebot_messages_sample not found, skipping the sample flow', file=sys.stderr)
+
+    # recommend 需要使用者先選過餐別
+    for user_id in users:
+        bot.rest_recommand_memory.set(user_id, meal)
+    return flows
+
+
+def run_flow(client, factory, make_event, users, iterations, batch_size):
+    latencies = []
+    stages_before = metrics.snapshot()
+    started_at = time.perf_counter()
+    for i in range(iterations):
+        events = [make_event(users[(i * batch_size + j) % len(users)]) for j in range(batch_size)]
+        body, signature = factory.body(events)
+        request_started_at = time.perf_counter()
+        response = client.post('/callback', data=body.encode('utf-8'), headers={
+            'X-Line-Signature': signature,
+            'Content-Type': 'application/json',
+        })
+        latencies.append(time.perf_counter() - request_started_at)
+        if response.status_code != 200:
+            raise RuntimeError(f'/callback returned {response.status_code}')
+    elapsed = time.perf_counter() - started_at
+    if bot.event_dispatcher is not None:
+        bot.event_dispatcher.join()
+        elapsed = time.perf_counter() - started_at
+
+    stages = {}
+    for key, (count, total) in metrics.snapshot().items():
+        before_count, before_total = stages_before.get(key, (0, 0.0))
+        if count > before_count:
+            stages[key] = (total - before_total) / (count - before_count) * 1000
+    return {
+        'requests': iterations,
+        'events': iterations * batch_size,
+        'events_per_sec': iterations * batch_size / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'stages_mean_ms': stages,
+    }
+
+
+def compare(results, baseline, max_regression):
+    regressed = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        throughput = result['events_per_sec'] / base['events_per_sec'] - 1
+        p50 = result['p50_ms'] / base['p50_ms'] - 1
+        flag = ''
+        if throughput < -max_regression or p50 > max_regression:
+            flag = '  <-- regression'
+            regressed.append(name)
+        print(f'{name:<16} events/sec {throughput:+7.1%}   p50 {p50:+7.1%}{flag}')
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Replay signed webhook bodies against the Flask app.')
+    parser.add_argument('-n', '--iterations', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=1, help='events per webhook body')
+    parser.add_argument('--users', type=int, default=1000, help='distinct user ids to cycle through')
+    parser.add_argument('--flows', nargs='*', help='only run these flows')
+    parser.add_argument('--reply-latency', type=float, default=0.0, help='simulated LINE API latency in ms')
+    parser.add_argument('--save', metavar='NAME', help=f'save results to {BENCH_DIR}/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help=f'compare with {BENCH_DIR}/NAME.json')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    import_started_at = time.perf_counter()
+    import LINE_Bot as bot
+    import metrics
+    import_seconds = time.perf_counter() - import_started_at
+
+    stub_reply(args.reply_latency / 1000)
+    client = bot.app.test_client()
+    factory = WebhookBodyFactory(bot.keys['LINEBOT_SECRET_KEY'])
+    users = [f'Ubench{i:028d}' for i in range(args.users)]
+    flows = build_flows(bot, factory, users)
+
+    results = {}
+    for name, make_event in flows.items():
+        if args.flows and name not in args.flows:
+            continue
+        run_flow(client, factory, make_event, users, min(100, args.iterations), args.batch)  # warm-up
+        results[name] = result = run_flow(client, factory, make_event, users, args.iterations, args.batch)
+        print(f'{name:<16} {result["events_per_sec"]:10.0f} events/sec   p50 {result["p50_ms"]:.3f} ms   p99 {result["p99_ms"]:.3f} ms')
+        for stage, mean_ms in sorted(result['stages_mean_ms'].items()):
+            print(f'    {stage:<72} {mean_ms:.4f} ms')
+    print(f'import LINE_Bot took {import_seconds * 1000:.1f} ms')
+
+    if args.save:
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        with open(os.path.join(BENCH_DIR, f'{args.save}.json'), 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'import_seconds': import_seconds, 'flows': results}, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(os.path.join(BENCH_DIR, f'{args.compare}.json'), encoding='utf-8') as f:
+            baseline = json.load(f)['flows']
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
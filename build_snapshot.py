@@ -0,0 +1,18 @@
+import argparse
+import time
+
+from data_loader import build_lookup_tables
+from rest_index import REST_FILES, SNAPSHOT_PATH, build_rest_index, save_snapshot
+
+# 由 taichungeatba/*.csv 預先建好餐廳索引與查詢表 (評分展開、地理格子、全文搜尋)，啟動時直接載入，不必再解析 CSV 或重建
+# python build_snapshot.py [-o taichungeatba/rest_index.pickle]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the restaurant index snapshot from the CSV files.')
+    parser.add_argument('-o', '--output', default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    index = build_rest_index(REST_FILES)
+    save_snapshot(index, args.output, build_lookup_tables(index))
+    count = sum(len(rests) for sections in index.values() for rests in sections.values())
+    print(f'Wrote {count} restaurants to {args.output} in {time.perf_counter() - started_at:.3f}s')
@@ -0,0 +1,178 @@
+import logging
+import os
+import threading
+import time
+
+from geo_index import GridIndex
+from rest_index import COORDS_PATH, REST_FILES, build_rest_index, expand_by_rating, is_snapshot_fresh, load_snapshot
+from search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def unique_shops(rests):
+    # rest_id 含餐別，同一家店出現在多個餐別時有多筆；依 (店名, 地址) 只留第一筆，postback 用它的 rest_id
+    shops = {}
+    for rest in rests:
+        shops.setdefault((rest.name, rest.address), rest)
+    return shops.values()
+
+
+def build_lookup_tables(index):
+    """由 index 算出 request 時用的查詢表；build_snapshot.py 會一起存進 snapshot，啟動時不必重算。"""
+    # rest_id -> Restaurant，postback 只帶 ID，用它 O(1) 找回餐廳
+    by_id = {
+        rest.rest_id: rest
+        for sections in index.values() for rests in sections.values() for rest in rests
+    }
+    return {
+        'by_id': by_id,
+        # meal -> 區域 -> 依評分展開的 tuple，CSV 沒有評分時就是 index 裡同一個 tuple
+        'weighted': {
+            meal: {section: expand_by_rating(rests) for section, rests in sections.items()}
+            for meal, sections in index.items()
+        },
+        # meal -> GridIndex，只收有經緯度的餐廳
+        'geo': {
+            meal: GridIndex(rest for rests in sections.values() for rest in rests)
+            for meal, sections in index.items()
+        },
+        # 店名 + 評論的全文搜尋
+        'search': SearchIndex(unique_shops(by_id.values())),
+    }
+
+
+class RestData:
+    """某一版的餐廳資料，建好之後不再修改，reload 時整份換掉。"""
+
+    __slots__ = ('index', 'by_id', 'weighted', 'geo', 'search', 'generation', 'loaded_at', 'load_seconds', 'source')
+
+    def __init__(self, index, generation, source, tables=None):
+        self.index = index  # meal -> 區域 -> tuple(Restaurant)
+        if tables is None:
+            tables = build_lookup_tables(index)
+        self.by_id = tables['by_id']
+        self.weighted = tables['weighted']
+        self.geo = tables['geo']
+        self.search = tables['search']
+        self.generation = generation
+        self.source = source  # 'snapshot' 或 'csv'
+        self.loaded_at = time.time()
+        self.load_seconds = 0.0  # 由 RestDataLoader 在替換前填入
+
+
+class RestDataLoader:
+    """載入 taichungeatba/*.csv (或 build_snapshot.py 產生的 snapshot)，並在背景 thread 依 mtime 偵測變更後重新載入。
+
+    request thread 只讀 loader.current 這個參考，新資料在背景完整建好後才替換，
+    所以不會被 reload 阻塞，也不會看到建到一半的資料。
+    """
+
+    STATS_COUNTERS = ('reloads', 'failures')
+
+    def __init__(self, rest_files=REST_FILES, coords_path=COORDS_PATH, snapshot_path=None, interval=5.0, on_reload=None):
+        self.rest_files = rest_files
+        self.coords_path = coords_path
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.on_reload = on_reload
+        self.current = None
+        self._mtimes = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._reloads = 0
+        self._failures = 0
+        self._last_error = None
+        # 監看 thread 不會跟著 fork 到子 process (gunicorn preload)，子 process 要重新 start()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def source_paths(self):
+        return [*self.rest_files.values(), self.coords_path]
+
+    def _read_mtimes(self):
+        mtimes = {}
+        paths = self.source_paths
+        if self.snapshot_path:
+            paths.append(self.snapshot_path)
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+        return mtimes
+
+    def load(self):
+        with self._lock:
+            mtimes = self._read_mtimes()
+            started_at = time.perf_counter()
+            snapshot = self._load_snapshot()
+            if snapshot is not None:
+                (index, tables), source = snapshot, 'snapshot'
+            else:
+                index, tables, source = build_rest_index(self.rest_files, self.coords_path), None, 'csv'
+            generation = self.current.generation + 1 if self.current is not None else 1
+            data = RestData(index, generation, source, tables)
+            data.load_seconds = time.perf_counter() - started_at
+            self.current = data
+            self._mtimes = mtimes
+            self._reloads += 1
+        if self.on_reload is not None:
+            self.on_reload(data)
+        logger.info('Loaded restaurant data generation %d from %s in %.3fs', data.generation, data.source, data.load_seconds)
+        return data
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not is_snapshot_fresh(self.snapshot_path, self.source_paths):
+            return None
+        try:
+            return load_snapshot(self.snapshot_path)
+        except Exception as e:
+            # 舊版本或損毀的 snapshot 不能讓啟動失敗，改讀 CSV；重新執行 build_snapshot.py 即可
+            logger.warning('Ignoring unusable snapshot %s (%r), loading the CSV files instead', self.snapshot_path, e)
+            return None
+
+    def check(self):
+        if self._read_mtimes() == self._mtimes:
+            return False
+        self.load()
+        return True
+
+    def start(self):
+        # 每個 request 都會呼叫，已啟動時不拿 lock 直接返回；不用 self._lock，reload 期間才不會卡住 request
+        if self.interval <= 0 or self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch, name='rest-data-watcher', daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:
+                # CSV 改到一半或格式錯誤時沿用舊資料，下次輪詢再試
+                self._failures += 1
+                self._last_error = repr(e)
+                logger.exception('Failed to reload restaurant data')
+
+    def stats(self):
+        data = self.current
+        return {
+            'generation': data.generation if data else 0,
+            'loaded_at': data.loaded_at if data else 0.0,
+            'load_seconds': data.load_seconds if data else 0.0,
+            'source': data.source if data else None,
+            'reloads': self._reloads,
+            'failures': self._failures,
+            'last_error': self._last_error,
+        }
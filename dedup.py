@@ -0,0 +1,46 @@
+import threading
+
+
+class EventDeduplicator:
+    """以 webhookEventId 記住一段時間內處理過的事件，LINE 重送 (isRedelivery) 時直接略過。"""
+
+    STATS_COUNTERS = ('checked', 'skipped', 'redeliveries')
+
+    def __init__(self, store):
+        self.store = store  # session_store 的任一種實作，ttl 即去重的時間窗
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._skipped = 0
+        self._redeliveries = 0
+
+    def is_duplicate(self, event):
+        event_id = getattr(event, 'webhook_event_id', None)
+        if not event_id:
+            return False
+        delivery_context = getattr(event, 'delivery_context', None)
+        redelivery = bool(getattr(delivery_context, 'is_redelivery', False))
+        duplicate = not self.store.add(event_id, '1')
+        with self._lock:
+            self._checked += 1
+            self._redeliveries += redelivery
+            self._skipped += duplicate
+        return duplicate
+
+    def filter(self, events):
+        return [event for event in events if not self.is_duplicate(event)]
+
+    def forget(self, event):
+        # 事件最後沒有被處理 (例如佇列已滿回 503)，讓 LINE 重送時能再處理一次
+        event_id = getattr(event, 'webhook_event_id', None)
+        if event_id:
+            self.store.delete(event_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'checked': self._checked,
+                'skipped': self._skipped,
+                'redeliveries': self._redeliveries,
+                'skip_rate': self._skipped / self._checked if self._checked else 0.0,
+                'window_size': len(self.store),
+            }
@@ -0,0 +1,167 @@
+import logging
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+def get_event_user_key(event):
+    # 同一個使用者 (或群組) 的事件要落在同一個 worker，才能保持先後順序
+    source = getattr(event, 'source', None)
+    for attr in ('user_id', 'group_id', 'room_id'):
+        value = getattr(source, attr, None)
+        if value:
+            return value
+    return ''
+
+
+class EventDispatcher:
+    """把 webhook 事件放進有上限的佇列，由背景 thread 依序呼叫 dispatch(event)。"""
+
+    STATS_COUNTERS = ('enqueued', 'processed', 'rejected', 'failed', 'wait_seconds_total', 'handle_seconds_total')
+
+    def __init__(self, dispatch, workers=4, maxsize=1000, put_timeout=0.5):
+        self._dispatch = dispatch
+        self._put_timeout = put_timeout
+        shard_size = max(1, maxsize // workers)
+        self._queues = [queue.Queue(maxsize=shard_size) for _ in range(workers)]
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._enqueued = 0
+        self._processed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._handle_seconds_total = 0.0
+
+    def start(self):
+        # thread 不會跟著 fork 過去，所以在第一次 submit 時才啟動
+        with self._start_lock:
+            if self._threads:
+                return
+            for i, q in enumerate(self._queues):
+                thread = threading.Thread(target=self._run, args=(q,), name=f'linebot-event-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, event):
+        if not self._threads:
+            self.start()
+        key = get_event_user_key(event)
+        q = self._queues[zlib.crc32(key.encode()) % len(self._queues)]
+        try:
+            q.put((time.perf_counter(), event), timeout=self._put_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            return False
+        with self._stats_lock:
+            self._enqueued += 1
+        return True
+
+    def _run(self, q):
+        while True:
+            enqueued_at, event = q.get()
+            started_at = time.perf_counter()
+            failed = False
+            try:
+                self._dispatch(event)
+            except Exception:
+                failed = True
+                logger.exception('Failed to handle webhook event')
+            finally:
+                finished_at = time.perf_counter()
+                wait = started_at - enqueued_at
+                with self._stats_lock:
+                    self._processed += 1
+                    self._failed += failed
+                    self._wait_seconds_total += wait
+                    self._wait_seconds_max = max(self._wait_seconds_max, wait)
+                    self._handle_seconds_total += finished_at - started_at
+                q.task_done()
+
+    def join(self):
+        for q in self._queues:
+            q.join()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'queue_depth': sum(q.qsize() for q in self._queues),
+                'queue_capacity': sum(q.maxsize for q in self._queues),
+                'workers': len(self._threads),
+                'enqueued': self._enqueued,
+                'processed': self._processed,
+                'rejected': self._rejected,
+                'failed': self._failed,
+                'wait_seconds_total': self._wait_seconds_total,
+                'wait_seconds_max': self._wait_seconds_max,
+                'handle_seconds_total': self._handle_seconds_total,
+            }
+
+
+class BatchDispatcher:
+    """一次處理整個 webhook payload: 不同使用者的事件同時回覆，同一使用者的事件照順序。"""
+
+    STATS_COUNTERS = ('batches', 'processed', 'failed')
+
+    def __init__(self, dispatch, max_concurrency=8):
+        self._dispatch = dispatch
+        self.max_concurrency = max_concurrency
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._processed = 0
+        self._failed = 0
+
+    def _get_executor(self):
+        # 與 EventDispatcher 一樣，fork 之後第一次用到才建立 thread
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='linebot-batch')
+        return self._executor
+
+    def _run_chain(self, events):
+        # 一個事件失敗不影響同一批的其他事件；/callback 仍回 200，失敗次數由 stats() 的 failed 呈現
+        failed = 0
+        for event in events:
+            try:
+                self._dispatch(event)
+            except Exception:
+                failed += 1
+                logger.exception('Failed to handle webhook event')
+        with self._stats_lock:
+            self._processed += len(events)
+            self._failed += failed
+
+    def dispatch(self, events):
+        started_at = time.perf_counter()
+        chains = {}
+        for event in events:
+            chains.setdefault(get_event_user_key(event), []).append(event)
+        if len(chains) <= 1 or self.max_concurrency <= 1:
+            for chain in chains.values():
+                self._run_chain(chain)
+        else:
+            executor = self._get_executor()
+            wait([executor.submit(self._run_chain, chain) for chain in chains.values()])
+        elapsed = time.perf_counter() - started_at
+        with self._stats_lock:
+            self._batches += 1
+        logger.info('Handled %d event(s) from %d source(s) in %.1f ms', len(events), len(chains), elapsed * 1000)
+        return elapsed
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'processed': self._processed,
+                'failed': self._failed,
+            }
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 本機的假 LINE Messaging API，只回應 reply，給 benchmark / 壓測用，不會真的送出訊息
+#   python fake_line_api.py --port 8081 --latency 20
+#   LINEBOT_API_HOST=http://127.0.0.1:8081 hypercorn LINE_Bot_async:app
+REPLY_PATH = '/v2/bot/message/reply'
+REPLY_BODY = json.dumps({'sentMessages': [{'id': '1', 'quoteToken': 'fake'}]}).encode('utf-8')
+
+
+def make_self_signed_cert(directory):
+    # 產生 127.0.0.1 的自簽憑證，client 端以 Configuration.ssl_ca_cert 指向同一個檔案
+    cert_path = os.path.join(directory, 'fake_line_api.pem')
+    key_path = os.path.join(directory, 'fake_line_api.key')
+    subprocess.run([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+        '-keyout', key_path, '-out', cert_path,
+    ], check=True, capture_output=True)
+    return cert_path, key_path
+
+
+class _ReplyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive，連線池才有東西可以重用
+    disable_nagle_algorithm = True  # header 與 body 分開送，不關掉 Nagle 每次回應會多等 ~40ms 的 delayed ACK
+
+    def setup(self):
+        super().setup()
+        self.server.fake_api._count('connections')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        fake_api = self.server.fake_api
+        if fake_api.latency:
+            time.sleep(fake_api.latency)
+        if self.path != REPLY_PATH:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        fake_api._count('replies')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(REPLY_BODY)))
+        self.end_headers()
+        self.wfile.write(REPLY_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeLineApi:
+    """在背景 thread 跑的 HTTP(S) server，記錄收到幾條連線與幾次 reply。"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, cert_path=None, key_path=None):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._counts = {'connections': 0, 'replies': 0}
+        self._server = ThreadingHTTPServer((host, port), _ReplyHandler)
+        self._server.daemon_threads = True
+        self._server.fake_api = self
+        self.scheme = 'http'
+        if cert_path:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_path, key_path)
+            # handshake 延到各自的 handler thread 做，不卡住 accept
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True, do_handshake_on_connect=False)
+            self.scheme = 'https'
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'{self.scheme}://{host}:{port}'
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            for key in self._counts:
+                self._counts[key] = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-line-api', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a local fake LINE Messaging API reply endpoint.')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated reply latency in ms')
+    args = parser.parse_args()
+
+    fake_api = FakeLineApi(port=args.port, latency=args.latency / 1000)
+    print(f'Fake LINE API listening on {fake_api.url}', flush=True)
+    try:
+        fake_api._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
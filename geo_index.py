@@ -0,0 +1,70 @@
+import heapq
+import math
+
+EARTH_RADIUS = 6371000.0
+METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    # 等距圓柱近似，城市範圍內誤差很小，比 haversine 便宜
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return EARTH_RADIUS * math.hypot(x, y)
+
+
+class GridIndex:
+    """把有座標的餐廳放進固定大小的經緯度格子，由近到遠一圈一圈找最近的 k 間。"""
+
+    def __init__(self, items, cell_size=0.01):
+        self.cell_size = cell_size
+        cells = {}
+        for item in items:
+            if item.lat is None or item.lng is None:
+                continue
+            cells.setdefault(self._cell(item.lat, item.lng), []).append(item)
+        self._cells = {key: tuple(value) for key, value in cells.items()}
+        self.size = sum(len(value) for value in self._cells.values())
+
+    def __len__(self):
+        return self.size
+
+    def _cell(self, lat, lng):
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def _ring(self, ci, cj, r):
+        if r == 0:
+            yield (ci, cj)
+            return
+        for i in range(ci - r, ci + r + 1):
+            yield (i, cj - r)
+            yield (i, cj + r)
+        for j in range(cj - r + 1, cj + r):
+            yield (ci - r, j)
+            yield (ci + r, j)
+
+    def nearest(self, lat, lng, k=3, predicate=None, max_distance=20000):
+        """回傳 [(距離公尺, item), ...]，由近到遠，最多 k 筆，只找 max_distance 公尺內。"""
+        if not self._cells or k <= 0:
+            return []
+        ci, cj = self._cell(lat, lng)
+        # 往外一圈，經度方向的格子寬度最窄，用它估下一圈最近可能的距離
+        ring_width = self.cell_size * METERS_PER_DEGREE * min(1.0, math.cos(math.radians(lat)))
+        max_ring = int(max_distance / ring_width) + 1
+        best = []  # max-heap: (-distance, seq, item)
+        seq = 0
+        for r in range(max_ring + 1):
+            for cell in self._ring(ci, cj, r):
+                for item in self._cells.get(cell, ()):
+                    if predicate is not None and not predicate(item):
+                        continue
+                    d = distance_m(lat, lng, item.lat, item.lng)
+                    if d > max_distance:
+                        continue
+                    seq += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, seq, item))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, seq, item))
+            if len(best) == k and -best[0][0] <= r * ring_width:
+                break
+        return [(-d, item) for d, _, item in sorted(best, reverse=True)]
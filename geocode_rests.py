@@ -0,0 +1,52 @@
+import argparse
+import csv
+import json
+import time
+import urllib.parse
+import urllib.request
+
+from rest_index import COORDS_PATH, REST_FILES, read_coords, read_rests
+
+# 離線把餐廳地址轉成經緯度，結果存成 taichungeatba/rest_coords.csv，啟動時直接讀這份對照表
+# 已經查過的地址不會重查，CSV 新增餐廳後再跑一次即可
+# python geocode_rests.py [--delay 1.0]
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+USER_AGENT = 'taichungeatba-linebot-geocoder/1.0'
+
+
+def geocode(address):
+    query = urllib.parse.urlencode({'q': address, 'format': 'json', 'limit': 1, 'countrycodes': 'tw'})
+    req = urllib.request.Request(f'{NOMINATIM_URL}?{query}', headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        results = json.load(resp)
+    if not results:
+        return None
+    return float(results[0]['lat']), float(results[0]['lon'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Geocode restaurant addresses into the coordinates file.')
+    parser.add_argument('-o', '--output', default=COORDS_PATH)
+    parser.add_argument('--delay', type=float, default=1.0, help='seconds between requests (Nominatim allows 1 req/s)')
+    args = parser.parse_args()
+
+    coords = read_coords(args.output)
+    addresses = sorted({rest.address for path in REST_FILES.values() for rest in read_rests(path) if rest.address})
+    missing = [address for address in addresses if address not in coords]
+    for i, address in enumerate(missing, 1):
+        try:
+            result = geocode(address)
+        except OSError as e:
+            print(f'[{i}/{len(missing)}] {address}: {e}')
+            result = None
+        if result is not None:
+            coords[address] = result
+        print(f'[{i}/{len(missing)}] {address}: {result}')
+        time.sleep(args.delay)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['address', 'lat', 'lng'])
+        for address in sorted(coords):
+            writer.writerow([address, *coords[address]])
+    print(f'Wrote {len(coords)}/{len(addresses)} coordinates to {args.output}')
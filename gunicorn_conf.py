@@ -0,0 +1,59 @@
+import gc
+import logging
+import multiprocessing
+import os
+
+import metrics
+
+# 正式環境啟動: gunicorn -c gunicorn_conf.py LINE_Bot:app
+# preload_app 讓 master 先 import LINE_Bot，餐廳資料只載入一次，fork 出來的 worker 以 copy-on-write 共用
+# 多個 worker 之間的使用者 session / 去重記錄要共用時，設定 LINEBOT_SESSION_STORE / LINEBOT_DEDUP_STORE=sqlite:///path
+#
+# 更新餐廳資料:
+#   kill -HUP <master pid>  master 重新載入資料後 fork 新的 worker，舊 worker 處理完手上的 request 才結束，
+#                            資料仍然只有一份共用 (建議的方式)
+#   LINEBOT_RELOAD_INTERVAL  > 0 時每個 worker 各自監看 CSV 並在背景重新載入，不必重啟，
+#                            但 reload 後每個 worker 各有一份私有的資料，記憶體隨 worker 數線性增加，
+#                            直到下一次 HUP 才恢復共用；worker 多時建議設為 0，只用 HUP 更新
+bind = os.environ.get('LINEBOT_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('LINEBOT_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('LINEBOT_THREADS', 8))
+preload_app = True
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def format_memory(stats):
+    return ', '.join(f'{key[:-6]}={value / 1024 / 1024:.1f}MiB' for key, value in stats.items() if key.endswith('_bytes'))
+
+
+def when_ready(server):
+    # 把目前所有物件移到 GC 的永久世代，worker 裡的 GC 不會再掃描 (寫入) 這些 page，才不會把共用的資料複製一份
+    gc.freeze()
+    logger.info('Master %d ready, %s', os.getpid(), format_memory(metrics.process_memory()))
+
+
+def on_reload(server):
+    # HUP: preload 時 gunicorn 不會重新 import LINE_Bot，由這裡在 master 重新載入資料，
+    # 之後 fork 的新 worker 共用新資料。master 不跑監看 thread，只在 HUP 時檢查一次
+    import LINE_Bot
+    try:
+        reloaded = LINE_Bot.rest_loader.check()
+    except Exception:
+        # CSV 有誤時沿用舊資料，新 worker 照常啟動
+        logger.exception('Failed to reload restaurant data in master %d', os.getpid())
+        return
+    if reloaded:
+        gc.freeze()
+        logger.info('Master %d reloaded restaurant data, %s', os.getpid(), format_memory(metrics.process_memory()))
+
+
+def post_fork(server, worker):
+    # 監看 thread 只在 worker 裡啟動 (LINEBOT_RELOAD_INTERVAL <= 0 時不啟動)，master 保持單一 thread 再 fork
+    import LINE_Bot
+    LINE_Bot.rest_loader.start()
+
+
+def post_worker_init(worker):
+    logger.info('Worker %d started, %s', os.getpid(), format_memory(metrics.process_memory()))
@@ -0,0 +1,58 @@
+class IntentRouter:
+    """文字訊息的路由表。
+
+    exact() 註冊完全相符的指令，pattern() 依註冊順序比對其他訊息，都不符合時交給 fallback()。
+    compile() 會把已知指令 (例如每個 #<區域>) 事先跑過一次 pattern 比對並存進 dict，
+    之後同樣的訊息只需要一次 dict 查詢，結果與逐條比對完全相同。
+    """
+
+    def __init__(self):
+        self._exact = {}
+        self._patterns = []
+        self._table = {}
+        self._compiled_texts = ()
+        self.default = None
+
+    def exact(self, *texts):
+        def decorator(func):
+            for text in texts:
+                self._exact[text] = func
+            self._rebuild()
+            return func
+        return decorator
+
+    def pattern(self, predicate):
+        def decorator(func):
+            self._patterns.append((predicate, func))
+            self._rebuild()
+            return func
+        return decorator
+
+    def fallback(self, func):
+        self.default = func
+        return func
+
+    def _match_patterns(self, text):
+        for predicate, func in self._patterns:
+            if predicate(text):
+                return func
+        return None
+
+    def _rebuild(self):
+        table = dict(self._exact)
+        for text in self._compiled_texts:
+            if text not in table:
+                func = self._match_patterns(text)
+                if func is not None:
+                    table[text] = func
+        self._table = table  # 整份替換，route() 不需要上鎖
+
+    def compile(self, texts):
+        self._compiled_texts = tuple(texts)
+        self._rebuild()
+
+    def route(self, text):
+        func = self._table.get(text)
+        if func is None:
+            func = self._match_patterns(text) or self.default
+        return func
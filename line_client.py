@@ -0,0 +1,66 @@
+import threading
+
+from urllib3.util.retry import Retry
+from linebot.v3.messaging import (
+    ApiClient,
+    MessagingApi,
+    ReplyMessageRequest,
+)
+
+import metrics
+
+# reply token 約一分鐘內有效，重試次數 x 逾時 + backoff 必須落在這之內
+REPLY_TOKEN_TTL = 60
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class LineClient:
+    """整個 process 共用一個 ApiClient (urllib3 連線池 + keep-alive)，thread-safe。"""
+
+    def __init__(self, configuration, pool_size=10, retries=2, backoff_factor=0.3, connect_timeout=3, read_timeout=10):
+        self._timeout = (connect_timeout, read_timeout)
+        attempts = retries + 1
+        max_backoff = sum(backoff_factor * (2 ** i) for i in range(retries))
+        if attempts * (connect_timeout + read_timeout) + max_backoff >= REPLY_TOKEN_TTL:
+            raise ValueError('Retry budget exceeds the reply token lifetime.')
+
+        configuration.connection_pool_maxsize = pool_size
+        configuration.retries = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=None,  # reply 是 POST，預設不會重試
+            respect_retry_after_header=False,  # Retry-After 可能比 reply token 還長
+            raise_on_status=False,
+        )
+        self._configuration = configuration
+        self._lock = threading.Lock()
+        self._api_client = None
+        self._messaging_api = None
+
+    @property
+    def messaging_api(self):
+        # 第一次使用時才建立連線池，gunicorn fork 之後每個 worker 各自一份
+        if self._messaging_api is None:
+            with self._lock:
+                if self._messaging_api is None:
+                    self._api_client = ApiClient(self._configuration)
+                    self._messaging_api = MessagingApi(self._api_client)
+        return self._messaging_api
+
+    def reply(self, reply_token, messages):
+        with metrics.timer('linebot_reply_seconds'):
+            return self.messaging_api.reply_message_with_http_info(
+                ReplyMessageRequest(
+                    reply_token=reply_token,
+                    messages=messages
+                ),
+                _request_timeout=self._timeout
+            )
+
+    def close(self):
+        with self._lock:
+            if self._api_client is not None:
+                self._api_client.close()
+            self._api_client = None
+            self._messaging_api = None
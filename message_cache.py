@@ -0,0 +1,44 @@
+import threading
+
+
+class MessageCache:
+    """固定不變的回覆訊息只建一次，之後每個 request 直接重用同一個物件。
+
+    取出的訊息物件會被多個 thread 共用，只能拿來回覆，不可以修改。
+    餐廳資料重新載入時呼叫 invalidate()，下次取用會重新建立。
+    """
+
+    STATS_COUNTERS = ('hits', 'builds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._messages = {}
+        self.generation = 0
+        self._hits = 0
+        self._builds = 0
+
+    def get(self, key, build):
+        message = self._messages.get(key)
+        if message is not None:
+            self._hits += 1
+            return message
+        with self._lock:
+            message = self._messages.get(key)
+            if message is None:
+                message = build()
+                self._messages[key] = message
+                self._builds += 1
+        return message
+
+    def invalidate(self):
+        with self._lock:
+            self._messages = {}
+            self.generation += 1
+
+    def stats(self):
+        return {
+            'size': len(self._messages),
+            'generation': self.generation,
+            'hits': self._hits,
+            'builds': self._builds,
+        }
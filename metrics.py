@@ -0,0 +1,169 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# 沒開 LINEBOT_METRICS 時，timed() 直接回傳原函式、timer() 回傳空的 context，幾乎沒有額外成本
+ENABLED = os.environ.get('LINEBOT_METRICS', '0').lower() in ('1', 'true', 'yes')
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_descriptions = {}
+_histograms = {}  # (name, labels) -> Histogram
+_collectors = []
+_null_timer = nullcontext()
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'lock')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+
+def describe(name, help_text):
+    _descriptions[name] = help_text
+
+
+def get_histogram(name, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _lock:
+            histogram = _histograms.setdefault(key, Histogram())
+    return histogram
+
+
+def observe(name, value, **labels):
+    if ENABLED:
+        get_histogram(name, **labels).observe(value)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'started_at')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started_at)
+        return False
+
+
+def timer(name, **labels):
+    if not ENABLED:
+        return _null_timer
+    return _Timer(get_histogram(name, **labels))
+
+
+def timed(name, **labels):
+    def decorator(func):
+        if not ENABLED:
+            return func
+        histogram = get_histogram(name, **labels)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started_at)
+        return wrapper
+    return decorator
+
+
+def register_collector(prefix, stats, help_text='', counters=()):
+    """scrape 時呼叫 stats()，把回傳 dict 裡的數值輸出成 <prefix>_<key> gauge。
+
+    counters 列出只會遞增的 key (累計次數、累計秒數)，改以 counter 輸出，名稱加上 _total。
+    """
+    _collectors.append((prefix, stats, help_text, frozenset(counters)))
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in items) + '}'
+
+
+def render():
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+    seen = set()
+    for (name, labels), histogram in histograms:
+        if name not in seen:
+            seen.add(name)
+            if name in _descriptions:
+                lines.append(f'# HELP {name} {_descriptions[name]}')
+            lines.append(f'# TYPE {name} histogram')
+        with histogram.lock:
+            counts = list(histogram.counts)
+            count, total = histogram.count, histogram.sum
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+        lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {count}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    for prefix, stats, help_text, counters in _collectors:
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f'{prefix}_{key}'
+            metric_type = 'gauge'
+            if key in counters:
+                metric_type = 'counter'
+                if not name.endswith('_total'):
+                    name += '_total'
+            if help_text:
+                lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot():
+    # {'name{labels}': (count, sum)}，給 bench_webhook.py 之類的工具計算各階段耗時
+    with _lock:
+        histograms = list(_histograms.items())
+    result = {}
+    for (name, labels), histogram in histograms:
+        with histogram.lock:
+            result[f'{name}{_format_labels(labels)}'] = (histogram.count, histogram.sum)
+    return result
+
+
+def process_memory():
+    # Linux 限定: rss 為常駐記憶體；pss 依共用程度分攤，多個 worker 共用同一份資料時 pss 會明顯小於 rss
+    stats = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                    stats[f'{key.lower()}_bytes'] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return stats
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """每個使用者一個 token bucket: 每秒補 rate 個，最多存 burst 個。
+
+    bucket 以 LRU 保存，最多 maxsize 個，閒置超過 idle_ttl 秒的順便清掉。
+    """
+
+    STATS_COUNTERS = ('allowed', 'limited', 'evictions')
+
+    def __init__(self, rate=1.0, burst=5, maxsize=100000, idle_ttl=600):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self._allowed = 0
+        self._limited = 0
+        self._evictions = 0
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+                self._allowed += 1
+            else:
+                self._limited += 1
+            self._evict(now)
+        return allowed
+
+    def _evict(self, now):
+        # 最舊的在最前面，閒置太久或超過上限就移除；閒置的 bucket 早已補滿，移除不影響結果
+        while self._buckets:
+            key, (tokens, updated_at) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.maxsize and now - updated_at < self.idle_ttl:
+                break
+            del self._buckets[key]
+            self._evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._buckets),
+                'allowed': self._allowed,
+                'limited': self._limited,
+                'evictions': self._evictions,
+            }
+
+
+class ConcurrencyLimiter:
+    """同時處理中的 webhook 超過 limit 個就直接拒絕 (load shedding)，不排隊等待。"""
+
+    STATS_COUNTERS = ('shed',)
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit) if limit > 0 else None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._shed = 0
+
+    def try_acquire(self):
+        if self._semaphore is None:
+            return True
+        if not self._semaphore.acquire(blocking=False):
+            with self._lock:
+                self._shed += 1
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self):
+        if self._semaphore is None:
+            return
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'shed': self._shed,
+            }
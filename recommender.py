@@ -0,0 +1,53 @@
+import math
+import random
+
+
+class Recommender:
+    """每個使用者在每個 (餐別, 區域) 依序走過一個隨機排列，整輪都推薦過才會重複。
+
+    排列不另外存，用 index = (a * pos + b) % n (a 與 n 互質) 即時算出，
+    每個 (使用者, 餐別, 區域) 只需存 (n, a, b, pos) 幾個整數，每次推薦 O(k)。
+    狀態放在獨立的 session store (不和餐別記憶共用容量)，有 TTL，多 worker 時也能共用。
+    """
+
+    def __init__(self, store, k=3):
+        self.store = store
+        self.k = k
+
+    @staticmethod
+    def _new_cycle(n):
+        a = random.randrange(1, n) if n > 1 else 1
+        while math.gcd(a, n) != 1:
+            a = random.randrange(1, n)
+        return a, random.randrange(n)
+
+    def recommend(self, user_id, meal, section, rests, weighted=None):
+        """rests 為該區域的餐廳；weighted 為依評分展開後的序列 (沒有評分時省略)。"""
+        table = weighted or rests
+        n = len(table)
+        if n == 0:
+            return []
+        # 每個區域各自一個游標，在區域之間切換不會打斷原本那一輪
+        key = f'{user_id}|{meal}|{section}'
+        state = self.store.get(key)
+        if state is not None and state.startswith(f'{n}|'):
+            a, b, pos = (int(x) for x in state.split('|')[1:])
+        else:  # 第一次使用、游標過期或重新載入後餐廳數量改變: 開始新的一輪
+            (a, b), pos = self._new_cycle(n), 0
+
+        count = min(self.k, len(rests))
+        picks = []
+        seen = set()
+        for _ in range(2 * n):
+            rest = table[(a * pos + b) % n]
+            pos += 1
+            if pos == n:
+                (a, b), pos = self._new_cycle(n), 0
+            if id(rest) in seen:  # 依評分展開時同一間可能連續出現
+                continue
+            seen.add(id(rest))
+            picks.append(rest)
+            if len(picks) == count:
+                break
+        self.store.set(key, f'{n}|{a}|{b}|{pos}')
+        return picks
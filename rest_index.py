@@ -0,0 +1,177 @@
+import csv
+import hashlib
+import os
+import pickle
+import re
+
+REST_FILES = {
+    'breakfast_rest': 'taichungeatba/breakfast_rest.csv',
+    'lunch_rest': 'taichungeatba/lunch_rest.csv',
+    'dinner_rest': 'taichungeatba/dinner_rest.csv'
+}
+SECTION_COLUMN = '區域'
+# 輪播卡片一定要有標題與內文 (營業時間)，少了這些欄位整份 CSV 就不能用
+REQUIRED_COLUMNS = ('name', 'opentime', SECTION_COLUMN)
+# geocode_rests.py 離線產生的 address -> 經緯度對照表
+COORDS_PATH = 'taichungeatba/rest_coords.csv'
+
+
+class Restaurant:
+    __slots__ = ('rest_id', 'name', 'opentime', 'phone', 'section', 'address', 'comment', 'lat', 'lng', 'rating')
+
+    def __init__(self, name, opentime, phone, section, address, comment, lat=None, lng=None, rating=None, rest_id=''):
+        self.rest_id = rest_id
+        self.name = name
+        self.opentime = opentime
+        self.phone = phone
+        self.section = section
+        self.address = address
+        self.comment = comment
+        self.lat = lat
+        self.lng = lng
+        self.rating = rating
+
+    def __repr__(self):
+        return f'Restaurant({self.name!r}, {self.section!r})'
+
+
+def read_coords(path=COORDS_PATH):
+    coords = {}
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('lat') and row.get('lng'):
+                    coords[row['address'].strip()] = (float(row['lat']), float(row['lng']))
+    except FileNotFoundError:
+        pass
+    return coords
+
+
+def parse_rating(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_rests(path, coords=None):
+    coords = coords or {}
+    rests = []
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f'{path} is missing required column(s): {", ".join(missing)}')
+        for row in reader:
+            name = (row.get('name') or '').strip()
+            if not name:  # 沒有店名的列無法顯示成卡片，直接略過
+                continue
+            address = (row.get('address') or '').strip()
+            lat, lng = coords.get(address, (None, None))
+            rests.append(Restaurant(
+                name=name,
+                opentime=(row.get('opentime') or '').strip(),
+                phone=(row.get('phone') or '').strip(),
+                section=(row.get(SECTION_COLUMN) or '').strip(),
+                address=address,
+                comment=(row.get('comment') or '').strip(),
+                lat=lat,
+                lng=lng,
+                rating=parse_rating(row.get('rating'))  # CSV 沒有 rating 欄位時為 None
+            ))
+    return rests
+
+
+def group_by_section(rests):
+    groups = {}
+    for rest in rests:
+        if rest.section:
+            groups.setdefault(rest.section, []).append(rest)
+    # 與 pandas groupby 相同，區域依名稱排序
+    return {section: tuple(groups[section]) for section in sorted(groups)}
+
+
+def assign_rest_ids(meal, rests, used_ids):
+    # 由餐別 + 店名 + 地址算出短 ID，CSV 增刪其他列時不會變，舊的 postback 仍指向同一間
+    for rest in rests:
+        base = hashlib.blake2s(f'{meal}|{rest.name}|{rest.address}'.encode('utf-8'), digest_size=5).hexdigest()
+        rest_id, n = base, 1
+        while rest_id in used_ids:
+            n += 1
+            rest_id = f'{base}{n}'
+        used_ids.add(rest_id)
+        rest.rest_id = rest_id
+
+
+def build_rest_index(rest_files=REST_FILES, coords_path=COORDS_PATH):
+    # meal -> 區域 -> tuple(Restaurant)
+    coords = read_coords(coords_path)
+    used_ids = set()
+    index = {}
+    for meal, path in rest_files.items():
+        rests = read_rests(path, coords)
+        assign_rest_ids(meal, rests, used_ids)
+        index[meal] = group_by_section(rests)
+    return index
+
+
+OPENTIME_PATTERN = re.compile(r'(\d{1,2})[:：](\d{2})\s*[-~～至到]\s*(\d{1,2})[:：](\d{2})')
+
+
+def is_open_at(rest, minutes):
+    # opentime 解析得出 HH:MM-HH:MM 才判斷，格式不明的一律當作營業中
+    ranges = OPENTIME_PATTERN.findall(rest.opentime)
+    if not ranges:
+        return True
+    for start_h, start_m, end_h, end_m in ranges:
+        start = int(start_h) * 60 + int(start_m)
+        end = int(end_h) * 60 + int(end_m)
+        if start <= end:
+            if start <= minutes < end:
+                return True
+        elif minutes >= start or minutes < end:  # 營業到隔天凌晨
+            return True
+    return False
+
+
+def expand_by_rating(rests):
+    # 有評分時，每間餐廳依四捨五入後的評分重複出現 (至少一次)，評分高的被推薦的次數較多
+    if all(rest.rating is None for rest in rests):
+        return rests
+    return tuple(rest for rest in rests for _ in range(max(1, round(rest.rating or 0))))
+
+
+SNAPSHOT_PATH = 'taichungeatba/rest_index.pickle'
+SNAPSHOT_VERSION = 6
+
+
+def save_snapshot(index, path=SNAPSHOT_PATH, tables=None):
+    # tables 為 data_loader.build_lookup_tables() 的結果，與 index 存在同一個 pickle 裡才會共用同一批 Restaurant
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': SNAPSHOT_VERSION, 'index': index, 'tables': tables}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    # 回傳 (index, tables)，tables 可能是 None
+    with open(path, 'rb') as f:
+        snapshot = pickle.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'Unsupported snapshot version: {snapshot.get("version")}')
+    return snapshot['index'], snapshot['tables']
+
+
+def is_snapshot_fresh(path=SNAPSHOT_PATH, source_paths=(*REST_FILES.values(), COORDS_PATH)):
+    # snapshot 比所有 CSV 都新才使用，CSV 有修改就退回讀 CSV
+    try:
+        snapshot_mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    for csv_path in source_paths:
+        try:
+            if os.stat(csv_path).st_mtime_ns > snapshot_mtime:
+                return False
+        except FileNotFoundError:
+            continue
+    return True
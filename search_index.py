@@ -0,0 +1,81 @@
+import heapq
+import math
+import re
+from array import array
+
+# 店名比評論重要，命中店名的權重較高
+FIELD_WEIGHTS = (('name', 3.0), ('comment', 1.0))
+# posting 依權重由高到低排序，每個 token 最多只看前面這麼多筆，常見的字 (例如「好吃」) 也不會拖慢查詢
+MAX_POSTINGS_SCAN = 1000
+
+CJK_PATTERN = re.compile(r'[㐀-鿿豈-﫿]+')
+WORD_PATTERN = re.compile(r'[0-9a-z]+')
+
+
+def tokenize(text):
+    # 中文以相鄰兩字 (bigram) 為單位，單獨一個字時用單字；英數字以整個單字為單位
+    text = text.lower()
+    tokens = []
+    for run in CJK_PATTERN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    tokens.extend(WORD_PATTERN.findall(text))
+    return tokens
+
+
+class SearchIndex:
+    """店名 + 評論的倒排索引，每個 token 對應一組依權重排序的 (doc id array, 權重 array)。"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+        postings = {}
+        for doc_id, doc in enumerate(self.docs):
+            weights = {}
+            for field, field_weight in FIELD_WEIGHTS:
+                for token in tokenize(getattr(doc, field) or ''):
+                    weights[token] = weights.get(token, 0.0) + field_weight
+            if not weights:
+                continue
+            norm = math.sqrt(sum(weights.values()))  # 評論很長的店不會因為字多而佔便宜
+            for token, weight in weights.items():
+                postings.setdefault(token, ([], []))
+                ids, values = postings[token]
+                ids.append(doc_id)
+                values.append(weight / norm)
+
+        n = max(1, len(self.docs))
+        self._postings = {}
+        for token, (ids, values) in postings.items():
+            idf = math.log(1 + n / len(ids))
+            order = sorted(range(len(ids)), key=values.__getitem__, reverse=True)
+            self._postings[token] = (
+                array('I', (ids[i] for i in order)),
+                array('f', (values[i] * idf for i in order))
+            )
+
+    def __len__(self):
+        return len(self.docs)
+
+    @property
+    def token_count(self):
+        return len(self._postings)
+
+    def search(self, query, k=5, min_score=0.0):
+        """回傳 [(score, doc)]，score 以查詢中索引裡有的 token 的 idf 總和正規化:
+        店名完整命中約 0.6 以上，短評論裡命中約 0.3，只在長評論裡順帶出現一次約 0.2；
+        低於 min_score 的結果不回傳。"""
+        n = max(1, len(self.docs))
+        scores = {}
+        query_weight = 0.0
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            ids, weights = posting
+            query_weight += math.log(1 + n / len(ids))
+            for doc_id, weight in zip(ids[:MAX_POSTINGS_SCAN], weights[:MAX_POSTINGS_SCAN]):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score / query_weight, self.docs[doc_id]) for doc_id, score in top if score >= min_score * query_weight]
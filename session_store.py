@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class SessionStore(ABC):
+    """使用者 session 的共同介面: get / set / add / delete / stats，值一律是短字串。"""
+
+    STATS_COUNTERS = ('hits', 'misses', 'evictions', 'expirations')
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, value):
+        pass
+
+    @abstractmethod
+    def add(self, key, value):
+        # key 不存在 (或已過期) 才寫入並回傳 True，多個 thread / worker 同時呼叫也只有一個成功
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def _record(self, hits=0, misses=0, evictions=0, expirations=0):
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+            self._expirations += expirations
+
+    def stats(self):
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+class MemorySessionStore(SessionStore):
+    """單一 process 用的 LRU + TTL store，最多保留 maxsize 個使用者。"""
+
+    def __init__(self, maxsize=10000, ttl=1800):
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] <= now:
+                del self._data[key]
+                item = None
+                self._record(expirations=1)
+            if item is not None:
+                self._data.move_to_end(key)
+        self._record(hits=item is not None, misses=item is None)
+        return item[1] if item is not None else None
+
+    def _put(self, key, value, now):
+        # 呼叫前必須持有 self._lock
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        evicted = 0
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def set(self, key, value):
+        with self._lock:
+            evicted = self._put(key, value, time.monotonic())
+        if evicted:
+            self._record(evictions=evicted)
+
+    def add(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                return False
+            evicted = self._put(key, value, now)
+        if evicted:
+            self._record(evictions=evicted)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SqliteSessionStore(SessionStore):
+    """多個 gunicorn worker 共用的 store，SQLite WAL 模式讓讀寫互不阻塞。
+
+    每 PURGE_EVERY 次寫入清一次過期資料，並把超過 maxsize 的部分依最後寫入時間由舊到新刪掉，
+    所以筆數最多暫時超出 PURGE_EVERY 筆。get() 不更新時間，淘汰順序是「最久沒寫入」而不是 LRU。
+    """
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path, ttl=1800, table='sessions', maxsize=10000):
+        super().__init__(ttl)
+        self.path = path
+        self.table = table
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_expires_at ON {table} (expires_at)')
+        conn.commit()
+
+    def _connection(self):
+        # sqlite3 connection 不能跨 thread / fork 共用，每個 thread 各開一條
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            f'SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        self._record(hits=row is not None, misses=row is None)
+        return row[0] if row is not None else None
+
+    def set(self, key, value):
+        self._connection().execute(
+            f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, value, time.time() + self.ttl)
+        )
+        self._maybe_purge()
+
+    def add(self, key, value):
+        now = time.time()
+        conn = self._connection()
+        conn.execute(f'DELETE FROM {self.table} WHERE key = ? AND expires_at <= ?', (key, now))
+        cursor = conn.execute(
+            f'INSERT OR IGNORE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, value, now + self.ttl)
+        )
+        if cursor.rowcount:
+            self._maybe_purge()
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._connection().execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def _maybe_purge(self):
+        with self._writes_lock:
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY:
+                return
+        conn = self._connection()
+        cursor = conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+        expired = cursor.rowcount
+        excess = len(self) - self.maxsize
+        evicted = 0
+        if excess > 0:
+            # ttl 固定，expires_at 越小代表越久沒寫入
+            cursor = conn.execute(
+                f'DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY expires_at LIMIT ?)',
+                (excess,)
+            )
+            evicted = cursor.rowcount
+        self._record(evictions=evicted, expirations=expired)
+
+    def __len__(self):
+        return self._connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+
+def create_session_store(url='memory', ttl=1800, maxsize=10000, table='sessions'):
+    # 'memory' 或 'sqlite:///path/to/sessions.db'
+    if url == 'memory':
+        return MemorySessionStore(maxsize=maxsize, ttl=ttl)
+    if url.startswith('sqlite:///'):
+        return SqliteSessionStore(url[len('sqlite:///'):], ttl=ttl, table=table, maxsize=maxsize)
+    raise ValueError(f'Unsupported session store: {url}')
@@ -0,0 +1,124 @@
+import base64
+import csv
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import sys
+import time
+
+import pytest
+
+CHANNEL_SECRET = 'test-channel-secret'
+DISTRICTS = ('北區', '西屯區', '南屯區')
+MEALS = ('breakfast_rest', 'lunch_rest', 'dinner_rest')
+REST_COLUMNS = ['name', 'opentime', 'phone', '區域', 'address', 'comment']
+
+HANDLE_KEYS = f'''
+def get_secret_and_token():
+    return {{'LINEBOT_SECRET_KEY': {CHANNEL_SECRET!r}, 'LINEBOT_ACCESS_TOKEN': 'test-access-token'}}
+'''
+
+
+def write_rest_csvs(directory, per_district=5):
+    data_dir = os.path.join(directory, 'taichungeatba')
+    os.makedirs(data_dir, exist_ok=True)
+    for meal in MEALS:
+        with open(os.path.join(data_dir, f'{meal}.csv'), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(REST_COLUMNS)
+            for district in DISTRICTS:
+                for i in range(per_district):
+                    writer.writerow([
+                        f'{meal}{district}牛肉麵{i}', '07:00-14:00', f'04-2{i:07d}', district,
+                        f'台中市{district}測試路{i}號', '湯頭濃郁，牛肉麵好吃'
+                    ])
+
+
+@pytest.fixture(scope='session')
+def bot(tmp_path_factory):
+    """在暫存的部署目錄 (測試用 handle_keys.py + 合成 CSV) 裡 import LINE_Bot，整個測試只載入一次。"""
+    pytest.importorskip('flask')
+    pytest.importorskip('linebot.v3')
+    directory = str(tmp_path_factory.mktemp('deploy'))
+    with open(os.path.join(directory, 'handle_keys.py'), 'w', encoding='utf-8') as f:
+        f.write(HANDLE_KEYS)
+    write_rest_csvs(directory)
+
+    env = {
+        'LINEBOT_RELOAD_INTERVAL': '0',
+        'LINEBOT_REST_SNAPSHOT': '',
+        'LINEBOT_RATE_LIMIT': '1000000000',
+        'LINEBOT_RATE_BURST': '1000000000',
+    }
+    saved_env = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    sys.path.insert(0, directory)
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        import LINE_Bot
+    finally:
+        os.chdir(cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return LINE_Bot
+
+
+@pytest.fixture
+def replies(bot, monkeypatch):
+    """把送往 LINE API 的 reply 改成記錄下來: [(reply_token, messages), ...]。"""
+    sent = []
+    monkeypatch.setattr(bot.line_client, 'reply', lambda reply_token, messages: sent.append((reply_token, messages)))
+    return sent
+
+
+class WebhookFactory:
+    # webhookEventId 在整個測試期間都不能重複，否則會被 LINE_Bot 的去重略過
+    _seq = itertools.count(1)
+
+    def __init__(self, channel_secret=CHANNEL_SECRET):
+        self.channel_secret = channel_secret.encode('utf-8')
+
+    def text_event(self, user_id, text):
+        seq = next(self._seq)
+        return {
+            'type': 'message',
+            'mode': 'active',
+            'timestamp': int(time.time() * 1000),
+            'source': {'type': 'user', 'userId': user_id},
+            'webhookEventId': f'TEST{seq:022d}',
+            'deliveryContext': {'isRedelivery': False},
+            'replyToken': f'reply-token-{seq}',
+            'message': {'type': 'text', 'id': str(seq), 'quoteToken': f'q{seq}', 'text': text},
+        }
+
+    def postback_event(self, user_id, data):
+        seq = next(self._seq)
+        return {
+            'type': 'postback',
+            'mode': 'active',
+            'timestamp': int(time.time() * 1000),
+            'source': {'type': 'user', 'userId': user_id},
+            'webhookEventId': f'TEST{seq:022d}',
+            'deliveryContext': {'isRedelivery': False},
+            'replyToken': f'reply-token-{seq}',
+            'postback': {'data': data},
+        }
+
+    def post(self, client, events):
+        body = json.dumps({'destination': 'Utest', 'events': events}, ensure_ascii=False).encode('utf-8')
+        signature = base64.b64encode(hmac.new(self.channel_secret, body, hashlib.sha256).digest()).decode('utf-8')
+        return client.post('/callback', data=body, headers={
+            'X-Line-Signature': signature,
+            'Content-Type': 'application/json',
+        })
+
+
+@pytest.fixture
+def webhook():
+    return WebhookFactory()
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from session_store import MemorySessionStore, SqliteSessionStore
+
+
+@pytest.fixture(scope='module')
+def async_app(bot):
+    pytest.importorskip('quart')
+    import LINE_Bot_async
+    return LINE_Bot_async
+
+
+def test_memory_stores_run_on_the_event_loop(async_app):
+    assert not async_app.BLOCKING_SESSION_STORE
+    assert not async_app.BLOCKING_DEDUP_STORE
+
+
+def test_any_sqlite_store_used_by_handlers_moves_them_to_a_thread(async_app, tmp_path):
+    cursors = SqliteSessionStore(str(tmp_path / 'cursors.db'), table='recommend_cursors')
+    assert async_app.is_blocking(MemorySessionStore(), cursors)
+    assert async_app.is_blocking(cursors, MemorySessionStore())
+    assert not async_app.is_blocking(MemorySessionStore(), MemorySessionStore())
+
+
+def test_callbacks_beyond_the_limit_wait_their_turn(async_app, monkeypatch):
+    active = [0]
+    peak = [0]
+
+    async def process_callback():
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return 'OK'
+
+    async def run():
+        monkeypatch.setattr(async_app, 'callback_semaphore', asyncio.Semaphore(2))
+        monkeypatch.setattr(async_app, 'process_callback', process_callback)
+        return await asyncio.gather(*(async_app.callback() for _ in range(10)))
+
+    assert asyncio.run(run()) == ['OK'] * 10
+    assert peak[0] == 2
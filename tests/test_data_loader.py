@@ -0,0 +1,134 @@
+import csv
+import os
+import threading
+import time
+
+import pytest
+
+from conftest import REST_COLUMNS, write_rest_csvs
+from data_loader import RestDataLoader, build_lookup_tables
+from rest_index import REST_FILES, Restaurant
+
+
+def make_rest(name, rest_id, address='台中市北區測試路1號'):
+    return Restaurant(name, '07:00-14:00', '04-2000000', '北區', address, '湯頭濃郁，牛肉麵好吃', rest_id=rest_id)
+
+
+def test_shop_in_several_meals_is_searched_once():
+    index = {
+        'breakfast_rest': {'北區': (make_rest('阿嬤牛肉麵', 'b1'),)},
+        'lunch_rest': {'北區': (make_rest('阿嬤牛肉麵', 'l1'), make_rest('阿嬤牛肉麵', 'l2', address='台中市北區別的路2號'))},
+    }
+    tables = build_lookup_tables(index)
+    hits = tables['search'].search('牛肉麵', k=5)
+    assert sorted(rest.rest_id for score, rest in hits) == ['b1', 'l2']  # 同名不同地址是另一家店
+    assert all(rest.rest_id in tables['by_id'] for score, rest in hits)
+
+
+def make_loader(directory, **kwargs):
+    rest_files = {meal: os.path.join(directory, path) for meal, path in REST_FILES.items()}
+    return RestDataLoader(rest_files, os.path.join(directory, 'missing_coords.csv'), interval=0, **kwargs)
+
+
+def rewrite_csv(path, rows, columns=REST_COLUMNS):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    # 確保 mtime 一定改變，不受檔案系統時間精度影響
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_picks_up_a_rewritten_csv(tmp_path):
+    write_rest_csvs(str(tmp_path))
+    reloaded = []
+    loader = make_loader(str(tmp_path), on_reload=reloaded.append)
+    first = loader.load()
+    assert not loader.check()  # 檔案沒變不重新載入
+
+    lunch_path = loader.rest_files['lunch_rest']
+    rewrite_csv(lunch_path, [['新開的拉麵店', '11:00-21:00', '04-23456789', '東區', '台中市東區新路1號', '湯頭濃郁']])
+    assert loader.check()
+    data = loader.current
+    assert data is not first and data.generation == 2
+    assert [rest.name for rest in data.index['lunch_rest']['東區']] == ['新開的拉麵店']
+    assert '北區' not in data.index['lunch_rest']
+    assert [rest.name for score, rest in data.search.search('拉麵')] == ['新開的拉麵店']
+    assert reloaded == [first, data]
+    assert first.index['lunch_rest']['北區']  # 舊的那份不會被改動
+
+
+def test_failed_reload_keeps_the_old_data(tmp_path):
+    write_rest_csvs(str(tmp_path))
+    loader = make_loader(str(tmp_path))
+    first = loader.load()
+
+    lunch_path = loader.rest_files['lunch_rest']
+    rewrite_csv(lunch_path, [['壞掉的列', '北區']], columns=['name', '區域'])  # 少了 opentime 欄位
+    with pytest.raises(ValueError):
+        loader.check()
+    assert loader.current is first
+
+    rewrite_csv(lunch_path, [['修好的店', '07:00-14:00', '', '北區', '', '']])
+    assert loader.check()
+    assert [rest.name for rest in loader.current.index['lunch_rest']['北區']] == ['修好的店']
+
+
+class StopWatching(BaseException):
+    pass
+
+
+def test_watcher_counts_failures_and_keeps_polling(tmp_path, monkeypatch):
+    write_rest_csvs(str(tmp_path))
+    loader = make_loader(str(tmp_path))
+    first = loader.load()
+    rewrite_csv(loader.rest_files['lunch_rest'], [['壞掉的列']], columns=['name'])
+
+    sleeps = []
+
+    def sleep(seconds):
+        # 第一次醒來時 CSV 是壞的，第二次已修好，第三次結束監看迴圈
+        if len(sleeps) == 1:
+            rewrite_csv(loader.rest_files['lunch_rest'], [['修好的店', '07:00-14:00', '', '北區', '', '']])
+        elif len(sleeps) == 2:
+            raise StopWatching
+        sleeps.append(seconds)
+    monkeypatch.setattr(time, 'sleep', sleep)
+
+    with pytest.raises(StopWatching):
+        loader._watch()
+    stats = loader.stats()
+    assert (stats['failures'], stats['reloads'], stats['generation']) == (1, 2, 2)
+    assert 'opentime' in stats['last_error']
+    assert loader.current is not first
+
+
+def test_concurrent_start_runs_one_watcher(tmp_path, monkeypatch):
+    # 多個第一次的 request 同時呼叫 start()，只能有一個監看 thread
+    write_rest_csvs(str(tmp_path))
+    loader = make_loader(str(tmp_path))
+    loader.interval = 3600
+    barrier = threading.Barrier(8)
+
+    def first_request():
+        barrier.wait()
+        loader.start()
+    requests = [threading.Thread(target=first_request) for _ in range(8)]
+
+    started = []
+
+    class RecordingThread(threading.Thread):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            time.sleep(0.01)  # 拉長檢查 _thread 到設定 _thread 之間的空窗，沒有 lock 時其他 request 會跟著建立 thread
+
+        def start(self):
+            started.append(self)
+    monkeypatch.setattr(threading, 'Thread', RecordingThread)
+
+    for request in requests:
+        request.start()
+    for request in requests:
+        request.join()
+    assert len(started) == 1
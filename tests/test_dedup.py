@@ -0,0 +1,71 @@
+import copy
+import threading
+from types import SimpleNamespace
+
+from dedup import EventDeduplicator
+from session_store import MemorySessionStore, SqliteSessionStore
+
+
+def redelivered(event):
+    event = copy.deepcopy(event)
+    event['deliveryContext']['isRedelivery'] = True
+    return event
+
+
+def test_same_webhook_event_id_is_replied_once(bot, webhook, replies):
+    client = bot.app.test_client()
+    event = webhook.text_event('Udedup', '美食推薦')
+    assert webhook.post(client, [event]).status_code == 200
+    assert webhook.post(client, [redelivered(event)]).status_code == 200
+    assert [reply_token for reply_token, messages in replies] == [event['replyToken']]
+
+
+def test_events_without_id_are_never_deduplicated(bot, webhook, replies):
+    client = bot.app.test_client()
+    event = webhook.text_event('Unoid', '美食推薦')
+    event['webhookEventId'] = ''  # SDK 要求有這個欄位，空字串視為沒有 ID
+    for _ in range(3):
+        assert webhook.post(client, [event]).status_code == 200
+    assert len(replies) == 3
+
+    deduplicator = EventDeduplicator(MemorySessionStore())
+    events = [SimpleNamespace(webhook_event_id=None), SimpleNamespace()]
+    assert deduplicator.filter(events * 2) == events * 2
+    assert deduplicator.stats()['checked'] == 0
+
+
+def test_forget_lets_a_redelivery_through():
+    deduplicator = EventDeduplicator(MemorySessionStore())
+    event = SimpleNamespace(webhook_event_id='E1', delivery_context=SimpleNamespace(is_redelivery=False))
+    retry = SimpleNamespace(webhook_event_id='E1', delivery_context=SimpleNamespace(is_redelivery=True))
+    assert deduplicator.filter([event]) == [event]
+    assert deduplicator.filter([retry]) == []
+    deduplicator.forget(event)
+    assert deduplicator.filter([retry]) == [retry]
+    assert deduplicator.stats() == {
+        'checked': 3, 'skipped': 1, 'redeliveries': 2, 'skip_rate': 1 / 3, 'window_size': 1,
+    }
+
+
+def test_sqlite_add_is_atomic_across_connections(tmp_path):
+    path = str(tmp_path / 'dedup.db')
+    SqliteSessionStore(path, table='webhook_events')
+    keys = [f'E{i}' for i in range(200)]
+    threads_count = 4
+    barrier = threading.Barrier(threads_count)
+    results = [[] for _ in range(threads_count)]
+
+    def race(results):
+        # 每個 thread 各自開一個 store (各自的 connection)，同時搶著 add 同一批 key
+        store = SqliteSessionStore(path, table='webhook_events')
+        barrier.wait()
+        for key in keys:
+            results.append(store.add(key, '1'))
+
+    threads = [threading.Thread(target=race, args=(result,)) for result in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 每個 key 只有一條 connection 加成功
+    assert [sum(result[i] for result in results) for i in range(len(keys))] == [1] * len(keys)
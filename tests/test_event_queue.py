@@ -0,0 +1,87 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from event_queue import EventDispatcher
+
+
+def make_event(user_id, n):
+    return SimpleNamespace(source=SimpleNamespace(user_id=user_id), n=n)
+
+
+def test_events_from_the_same_user_are_handled_in_order():
+    handled = []
+
+    def dispatch(event):
+        time.sleep(random.random() / 1000)
+        handled.append((event.source.user_id, event.n))
+
+    dispatcher = EventDispatcher(dispatch, workers=4, maxsize=1000)
+    users = [f'U{i}' for i in range(8)]
+    for n in range(20):
+        for user_id in users:
+            assert dispatcher.submit(make_event(user_id, n))
+    dispatcher.join()
+    assert len(handled) == 20 * len(users)
+    for user_id in users:
+        assert [n for user, n in handled if user == user_id] == list(range(20))
+
+
+def test_stats_track_depth_rejections_and_failures():
+    release = threading.Event()
+    started = threading.Event()
+
+    def dispatch(event):
+        started.set()
+        release.wait(5)
+        if event.n == 1:
+            raise RuntimeError('boom')
+
+    dispatcher = EventDispatcher(dispatch, workers=1, maxsize=1, put_timeout=0.05)
+    assert dispatcher.submit(make_event('U1', 0))
+    assert started.wait(5)  # worker 拿走第一個，卡在 dispatch 裡
+    assert dispatcher.submit(make_event('U1', 1))
+    assert not dispatcher.submit(make_event('U1', 2))
+    stats = dispatcher.stats()
+    assert (stats['queue_depth'], stats['enqueued'], stats['rejected'], stats['processed']) == (1, 2, 1, 0)
+
+    release.set()
+    dispatcher.join()
+    stats = dispatcher.stats()
+    assert (stats['queue_depth'], stats['processed'], stats['failed']) == (0, 2, 1)
+
+
+def test_full_shard_returns_503_and_forgets_rejected_events(bot, webhook, replies, monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def dispatch(event):
+        started.set()
+        release.wait(5)
+        bot.dispatch_event(event)
+
+    # 單一 worker、佇列只放得下一個事件: 第一個事件卡在 dispatch，第二個排隊，第三個被拒
+    dispatcher = EventDispatcher(dispatch, workers=1, maxsize=1, put_timeout=0.05)
+    monkeypatch.setattr(bot, 'event_dispatcher', dispatcher)
+    client = bot.app.test_client()
+    first = webhook.text_event('Uqueue', '美食推薦')
+    assert webhook.post(client, [first]).status_code == 200
+    assert started.wait(5)
+    queued, rejected = webhook.text_event('Uqueue', '美食推薦'), webhook.text_event('Uqueue', '美食推薦')
+    assert webhook.post(client, [queued, rejected]).status_code == 503
+
+    store = bot.event_deduplicator.store
+    assert store.get(first['webhookEventId']) is not None
+    assert store.get(queued['webhookEventId']) is not None
+    assert store.get(rejected['webhookEventId']) is None
+    assert dispatcher.stats()['rejected'] == 1
+
+    release.set()
+    dispatcher.join()
+    # LINE 重送整批時，已排入的事件被略過，被拒的事件這次才處理
+    assert webhook.post(client, [queued, rejected]).status_code == 200
+    dispatcher.join()
+    assert [reply_token for reply_token, messages in replies] == [
+        first['replyToken'], queued['replyToken'], rejected['replyToken']
+    ]
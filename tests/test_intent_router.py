@@ -0,0 +1,71 @@
+from intent_router import IntentRouter
+
+
+def make_router():
+    router = IntentRouter()
+
+    @router.exact('#exact')
+    def exact(text):
+        return 'exact'
+
+    @router.pattern(lambda text: 'a' in text)
+    def has_a(text):
+        return 'a'
+
+    @router.pattern(lambda text: text.startswith('#'))
+    def hashtag(text):
+        return 'hashtag'
+
+    @router.fallback
+    def chat(text):
+        return 'chat'
+
+    return router
+
+
+def test_exact_match_wins_over_patterns():
+    router = make_router()
+    assert router.route('#exact')('#exact') == 'exact'
+
+
+def test_patterns_are_tried_in_registration_order():
+    router = make_router()
+    assert router.route('#a')('#a') == 'a'
+    assert router.route('#b')('#b') == 'hashtag'
+
+
+def test_unmatched_text_goes_to_fallback():
+    router = make_router()
+    assert router.route('hello')('hello') == 'chat'
+
+
+def test_exact_can_register_several_texts():
+    router = IntentRouter()
+
+    @router.exact('x', 'y')
+    def xy(text):
+        return text
+
+    assert router.route('x') is xy
+    assert router.route('y') is xy
+    assert router.route('z') is None
+
+
+def test_compiled_lookup_matches_uncompiled():
+    texts = ['#exact', '#a', '#b', 'abc', 'hello', '', '#']
+    router = make_router()
+    expected = {text: router.route(text) for text in texts}
+    router.compile(texts)
+    assert {text: router.route(text) for text in texts} == expected
+
+
+def test_patterns_registered_after_compile_are_applied():
+    router = IntentRouter()
+    router.compile(['#x'])
+    assert router.route('#x') is None
+
+    @router.pattern(lambda text: text.startswith('#'))
+    def hashtag(text):
+        return 'hashtag'
+
+    assert router.route('#x') is hashtag
@@ -0,0 +1,48 @@
+import pytest
+
+from rest_index import Restaurant
+
+
+@pytest.fixture
+def rest(bot):
+    return bot.rest_loader.current.index['lunch_rest']['北區'][0]
+
+
+def post_postback(bot, webhook, replies, data):
+    response = webhook.post(bot.app.test_client(), [webhook.postback_event('Upostback', data)])
+    assert response.status_code == 200
+    assert len(replies) == 1
+    reply_token, messages = replies[0]
+    return messages[0].text
+
+
+@pytest.mark.parametrize('action, field', [('addr', 'address'), ('tel', 'phone'), ('cmt', 'comment')])
+def test_postback_resolves_restaurant_by_id(bot, webhook, replies, rest, action, field):
+    assert bot.rest_loader.current.by_id[rest.rest_id] is rest
+    text = post_postback(bot, webhook, replies, f'a={action}&r={rest.rest_id}')
+    assert text.startswith(rest.name)
+    assert getattr(rest, field) in text
+
+
+@pytest.mark.parametrize('data', ['a=unknown&r={rest_id}', 'a=addr&r=missing', 'a=addr', '', 'action=buy&itemid=111'])
+def test_unknown_action_or_id_gets_the_fallback_reply(bot, webhook, replies, rest, data):
+    text = post_postback(bot, webhook, replies, data.format(rest_id=rest.rest_id))
+    assert text == '找不到這間餐廳的資料，請重新輸入<美食推薦>查詢~'
+
+
+def test_empty_field_uses_the_default_text(bot, rest):
+    class Blank:
+        name = rest.name
+        phone = ''
+    message = bot.create_postback_message(Blank, bot.POSTBACK_ACTIONS['tel'])
+    assert message.text == f'{rest.name}\n連絡電話: 這是電話'
+
+
+def test_carousel_postback_data_stays_short(bot, rest):
+    # 店名、地址、評論再長，postback 也只帶動作代碼與 ID
+    long_rest = Restaurant('很長的店名' * 20, rest.opentime, rest.phone, rest.section, '地址' * 200, '評論' * 1000, rest_id=rest.rest_id)
+    message = bot.create_rests_carousel([rest, long_rest])
+    for column in message.template.columns:
+        for action in column.actions:
+            assert action.data.endswith(f'&r={rest.rest_id}')
+            assert len(action.data) <= 20  # LINE 上限 300 字
@@ -0,0 +1,147 @@
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limit import ConcurrencyLimiter, TokenBucketLimiter
+
+
+def test_token_bucket_allows_burst_then_limits():
+    limiter = TokenBucketLimiter(rate=0.001, burst=3)
+    assert [limiter.allow('U1') for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow('U2')
+    assert limiter.stats()['limited'] == 1
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    limiter = TokenBucketLimiter(rate=2, burst=2)
+    assert limiter.allow('U1') and limiter.allow('U1')
+    assert not limiter.allow('U1')
+    now[0] += 0.5
+    assert limiter.allow('U1')
+    assert not limiter.allow('U1')
+
+
+def test_token_bucket_evicts_least_recently_used():
+    limiter = TokenBucketLimiter(rate=1, burst=1, maxsize=2)
+    for key in ('U1', 'U2', 'U3'):
+        limiter.allow(key)
+    stats = limiter.stats()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+
+
+def test_concurrency_limiter_sheds_over_limit():
+    limiter = ConcurrencyLimiter(2)
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+    assert limiter.stats() == {'limit': 2, 'in_flight': 2, 'shed': 1}
+
+
+def test_events_without_source_skip_the_limiter(bot, monkeypatch):
+    limiter = TokenBucketLimiter(rate=0.001, burst=1)
+    monkeypatch.setattr(bot, 'user_limiter', limiter)
+    for _ in range(3):
+        bot.build_event_responses(SimpleNamespace(reply_token='reply-token'))
+    assert limiter.stats()['allowed'] == 0
+    assert limiter.stats()['limited'] == 0
+
+
+def run_well_behaved_users(client, webhook, users, rounds):
+    # 每個使用者每輪只送一則，總數不超過 burst，都不應該被限流；回傳 ([reply token], [延遲], [status code])
+    reply_tokens, latencies, status_codes = [], [], []
+    for _ in range(rounds):
+        for user_id in users:
+            event = webhook.text_event(user_id, '美食推薦')
+            started_at = time.perf_counter()
+            response = webhook.post(client, [event])
+            latencies.append(time.perf_counter() - started_at)
+            reply_tokens.append(event['replyToken'])
+            status_codes.append(response.status_code)
+    return reply_tokens, latencies, status_codes
+
+
+def p99(latencies):
+    return statistics.quantiles(latencies, n=100)[98]
+
+
+class RecordingLimiter(TokenBucketLimiter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limited_keys = []
+
+    def allow(self, key):
+        allowed = super().allow(key)
+        if not allowed:
+            self.limited_keys.append(key)
+        return allowed
+
+
+def run_flood(bot, webhook, monkeypatch):
+    """一個使用者每次送 10 則狂刷，同時 50 個正常使用者各送 4 則 (reply 模擬 2ms 的 LINE API)。"""
+    limiter = RecordingLimiter(rate=1, burst=5)
+    monkeypatch.setattr(bot, 'user_limiter', limiter)
+    monkeypatch.setattr(bot, 'RATE_LIMIT_MODE', 'drop')
+    replied = []
+
+    def reply(reply_token, messages):
+        time.sleep(0.002)
+        replied.append(reply_token)
+    monkeypatch.setattr(bot.line_client, 'reply', reply)
+
+    client = bot.app.test_client()
+    run_well_behaved_users(client, webhook, [f'Uwarmup{i}' for i in range(20)], 1)
+    baseline = run_well_behaved_users(client, webhook, [f'Ubaseline{i}' for i in range(50)], 4)
+
+    stop = threading.Event()
+    flood_status_codes = []
+
+    def flood():
+        # 這裡的 assert 不會讓測試失敗，status code 交給主 thread 檢查
+        flood_client = bot.app.test_client()
+        while not stop.is_set():
+            response = webhook.post(flood_client, [webhook.text_event('Uflood', '美食推薦') for _ in range(10)])
+            flood_status_codes.append(response.status_code)
+
+    flooder = threading.Thread(target=flood)
+    flooder.start()
+    started_at = time.perf_counter()
+    try:
+        during_flood = run_well_behaved_users(client, webhook, [f'Uflooded{i}' for i in range(50)], 4)
+    finally:
+        stop.set()
+        flooder.join()
+    return SimpleNamespace(
+        limiter=limiter, replied=replied, baseline=baseline, during_flood=during_flood,
+        flood_status_codes=flood_status_codes, elapsed=time.perf_counter() - started_at,
+    )
+
+
+def test_flood_is_limited_without_affecting_well_behaved_users(bot, webhook, monkeypatch):
+    result = run_flood(bot, webhook, monkeypatch)
+    reply_tokens, _, status_codes = result.during_flood
+
+    assert set(status_codes) == {200}
+    assert set(result.flood_status_codes) == {200}
+    # 正常使用者一則都沒被限流，每則都有回覆
+    assert not [key for key in result.limiter.limited_keys if key != 'Uflood']
+    assert set(reply_tokens) <= set(result.replied)
+    # 洪水使用者最多只用掉 burst + rate * 時間 個 token，其餘事件都被略過
+    flood_events = len(result.flood_status_codes) * 10
+    assert flood_events > 100
+    assert len(result.limiter.limited_keys) >= flood_events - (5 + result.elapsed + 1)
+    assert len(result.replied) <= 20 + 2 * 50 * 4 + 5 + result.elapsed + 1
+
+
+@pytest.mark.perf
+def test_flood_does_not_slow_down_well_behaved_users(bot, webhook, monkeypatch):
+    # 量 wall-clock，機器忙碌時會不穩，預設不執行: pytest -m perf
+    result = run_flood(bot, webhook, monkeypatch)
+    # 正常使用者的 p99 維持不變 (容許 GIL 切換造成的幾毫秒抖動)
+    assert p99(result.during_flood[1]) <= 2 * p99(result.baseline[1]) + 0.005
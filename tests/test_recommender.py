@@ -0,0 +1,34 @@
+from recommender import Recommender
+from rest_index import Restaurant
+from session_store import MemorySessionStore
+
+
+def make_rests(section, n):
+    return tuple(Restaurant(f'{section}{i}', '', '', section, '', '') for i in range(n))
+
+
+def test_full_cycle_before_repeating():
+    recommender = Recommender(MemorySessionStore(), k=3)
+    rests = make_rests('北區', 9)
+    picks = [rest for _ in range(3) for rest in recommender.recommend('U1', 'lunch_rest', '北區', rests)]
+    assert sorted(rest.name for rest in picks) == sorted(rest.name for rest in rests)
+
+
+def test_switching_districts_keeps_each_cycle():
+    recommender = Recommender(MemorySessionStore(), k=3)
+    district_a, district_b = make_rests('北區', 9), make_rests('西區', 9)
+    picks_a = []
+    for _ in range(3):
+        picks_a += recommender.recommend('U1', 'lunch_rest', '北區', district_a)
+        recommender.recommend('U1', 'lunch_rest', '西區', district_b)
+    assert len({rest.name for rest in picks_a}) == 9
+
+
+def test_users_and_meals_have_separate_cursors():
+    store = MemorySessionStore()
+    recommender = Recommender(store, k=3)
+    rests = make_rests('北區', 6)
+    recommender.recommend('U1', 'lunch_rest', '北區', rests)
+    recommender.recommend('U1', 'dinner_rest', '北區', rests)
+    recommender.recommend('U2', 'lunch_rest', '北區', rests)
+    assert len(store) == 3
@@ -0,0 +1,92 @@
+import pytest
+
+# 固定 handle_message 的路由結果，與原本的 if/elif 鏈相同: sample -> 美食推薦 -> #...餐 -> #...區 -> 閒聊
+ROUTES = [
+    ('按鈕sample', 'route_sample'),
+    ('#北區sample', 'route_sample'),
+    ('美食推薦sample', 'route_sample'),
+    ('#文青早餐sample', 'route_sample'),
+    ('美食推薦', 'route_choose_time'),
+    ('我想要美食推薦!', 'route_choose_time'),
+    ('#美食推薦區', 'route_choose_time'),
+    ('#文青早餐', 'route_choose_section'),
+    ('#在地午餐', 'route_choose_section'),
+    ('#高檔晚餐', 'route_choose_section'),
+    ('#宵夜餐', 'route_choose_section'),
+    ('#北區', 'route_rests_recommand'),
+    ('#西屯區', 'route_rests_recommand'),
+    ('#不存在區', 'route_rests_recommand'),
+    ('你好', 'route_chat'),
+    ('文青早餐', 'route_chat'),
+    ('北區', 'route_chat'),
+    ('#', 'route_chat'),
+    ('', 'route_chat'),
+]
+
+
+@pytest.mark.parametrize('text, route_name', ROUTES)
+def test_route(bot, text, route_name):
+    assert bot.intent_router.route(text) is getattr(bot, route_name)
+
+
+def test_compiled_and_uncompiled_routes_agree(bot):
+    texts = [text for text, _ in ROUTES] + [f'#{district}' for district in bot.rest_loader.current.index['lunch_rest']]
+    compiled = {text: bot.intent_router.route(text) for text in texts}
+    bot.intent_router.compile(())
+    try:
+        assert {text: bot.intent_router.route(text) for text in texts} == compiled
+    finally:
+        bot.on_rest_data_reload(bot.rest_loader.current)
+
+
+def test_meal_command_remembers_meal_and_lists_districts(bot):
+    message = bot.intent_router.route('#在地午餐')('Uroute', '#在地午餐')
+    assert bot.rest_recommand_memory.get('Uroute') == 'lunch_rest'
+    labels = [item.action.label for item in message.quick_reply.items if item.action.type == 'message']
+    assert labels == list(bot.rest_loader.current.index['lunch_rest'])
+
+
+def test_unknown_meal_command_shows_the_meal_menu(bot, webhook, replies):
+    message = bot.intent_router.route('#宵夜餐')('Unightsnack', '#宵夜餐')
+    assert message.template.title == '歡迎使用!!'
+    assert bot.rest_recommand_memory.get('Unightsnack') is None
+
+    failed = bot.batch_dispatcher.stats()['failed']
+    response = webhook.post(bot.app.test_client(), [webhook.text_event('Unightsnack', '#宵夜餐')])
+    assert response.status_code == 200
+    assert [messages[0].template.title for reply_token, messages in replies] == ['歡迎使用!!']
+    assert bot.batch_dispatcher.stats()['failed'] == failed
+
+
+def test_district_without_meal_asks_to_choose_meal(bot):
+    message = bot.intent_router.route('#北區')('Unew', '#北區')
+    assert '美食推薦' in message.text
+
+
+def test_district_recommends_restaurants_from_that_district(bot):
+    bot.rest_recommand_memory.set('Udistrict', 'dinner_rest')
+    message = bot.intent_router.route('#西屯區')('Udistrict', '#西屯區')
+    titles = [column.title for column in message.template.columns]
+    assert len(titles) == 3
+    district_rests = {rest.name for rest in bot.rest_loader.current.index['dinner_rest']['西屯區']}
+    assert set(titles) <= district_rests
+
+
+def test_chat_replies_got_it(bot):
+    message = bot.intent_router.route('你好')('Uchat', '你好')
+    assert message.text == 'Got it!'
+
+
+def test_chat_about_food_replies_matching_restaurants(bot):
+    message = bot.intent_router.route('有推薦的牛肉麵嗎')('Uchat', '有推薦的牛肉麵嗎')
+    titles = [column.title for column in message.template.columns]
+    assert titles and all('牛肉麵' in title for title in titles)
+
+
+def test_webhook_routes_through_handle_message(bot, webhook, replies):
+    client = bot.app.test_client()
+    response = webhook.post(client, [webhook.text_event('Uwebhook', '美食推薦')])
+    assert response.status_code == 200
+    assert len(replies) == 1
+    reply_token, messages = replies[0]
+    assert messages[0].template.title == '歡迎使用!!'
@@ -0,0 +1,41 @@
+from rest_index import Restaurant
+from search_index import SearchIndex, tokenize
+
+
+def make_index():
+    rests = [
+        Restaurant('阿嬤牛肉麵', '', '', '北區', '', '湯頭濃郁，牛肉軟嫩，會再來', rest_id='beef'),
+        Restaurant('老王小吃', '', '', '北區', '', '服務親切，老闆說你好，謝謝光臨，份量大，停車方便，價格實惠，出餐很快', rest_id='chat'),
+        Restaurant('素食小館', '', '', '西屯區', '', '素食選擇多，清爽', rest_id='veg'),
+    ]
+    # 其他店讓 idf 接近實際資料量
+    rests.extend(Restaurant(f'早餐店{i}', '', '', '南屯區', '', '好吃，便宜，服務親切', rest_id=str(i)) for i in range(50))
+    return SearchIndex(rests)
+
+
+def test_tokenize_uses_bigrams_unigrams_and_words():
+    assert tokenize('牛肉麵') == ['牛肉', '肉麵']
+    assert tokenize('麵') == ['麵']
+    assert tokenize('CP值高') == ['值高', 'cp']
+
+
+def test_name_match_ranks_first():
+    hits = make_index().search('牛肉麵', k=3)
+    assert hits[0][1].rest_id == 'beef'
+
+
+def test_min_score_drops_words_only_shared_with_a_review():
+    index = make_index()
+    assert [rest.rest_id for score, rest in index.search('謝謝')] == ['chat']
+    assert index.search('謝謝', min_score=0.25) == []
+    assert index.search('你好', min_score=0.25) == []
+
+
+def test_unknown_words_in_a_sentence_do_not_lower_the_score():
+    index = make_index()
+    assert [rest.rest_id for score, rest in index.search('請問有素食嗎', min_score=0.25)] == ['veg']
+    assert [rest.rest_id for score, rest in index.search('有推薦的牛肉麵嗎', k=1, min_score=0.25)] == ['beef']
+
+
+def test_unmatched_query_returns_nothing():
+    assert make_index().search('哈哈') == []
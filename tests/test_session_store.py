@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from session_store import MemorySessionStore, SqliteSessionStore, create_session_store
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # MemorySessionStore 用 monotonic、SqliteSessionStore 用 time()，兩個一起控制
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    def make(ttl=60, maxsize=100):
+        if request.param == 'memory':
+            return MemorySessionStore(maxsize=maxsize, ttl=ttl)
+        return SqliteSessionStore(str(tmp_path / 'sessions.db'), ttl=ttl, maxsize=maxsize)
+    return make
+
+
+def test_get_set_delete(make_store):
+    store = make_store()
+    assert store.get('U1') is None
+    store.set('U1', 'lunch_rest')
+    assert store.get('U1') == 'lunch_rest'
+    store.set('U1', 'dinner_rest')
+    assert store.get('U1') == 'dinner_rest'
+    store.delete('U1')
+    assert store.get('U1') is None
+    stats = store.stats()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+
+
+def test_entries_expire_after_ttl(make_store, clock):
+    store = make_store(ttl=60)
+    store.set('U1', 'lunch_rest')
+    assert store.add('E1', '1')
+    clock[0] += 59
+    assert store.get('U1') == 'lunch_rest'
+    assert not store.add('E1', '1')
+    clock[0] += 2
+    assert store.get('U1') is None
+    assert store.add('E1', '1')  # 過期的 key 可以再加入
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(maxsize=2)
+    store.set('U1', 'a')
+    store.set('U2', 'b')
+    store.get('U1')  # U2 變成最久沒用到的
+    store.set('U3', 'c')
+    assert (store.get('U1'), store.get('U2'), store.get('U3')) == ('a', None, 'c')
+    assert store.stats()['evictions'] == 1
+
+
+def test_memory_store_counts_expirations(clock):
+    store = MemorySessionStore(ttl=10)
+    store.set('U1', 'a')
+    clock[0] += 11
+    assert store.get('U1') is None
+    assert store.stats()['expirations'] == 1
+    assert len(store) == 0
+
+
+def test_sqlite_purge_drops_expired_then_oldest_over_maxsize(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(SqliteSessionStore, 'PURGE_EVERY', 5)
+    store = SqliteSessionStore(str(tmp_path / 'sessions.db'), ttl=60, maxsize=2)
+    store.set('expired', 'x')
+    clock[0] += 61
+    for i in range(3):
+        clock[0] += 1
+        store.set(f'U{i}', str(i))
+    assert len(store) == 4  # 第 5 次寫入才清
+    clock[0] += 1
+    store.set('U3', '3')
+    assert len(store) == 2
+    assert [store.get(f'U{i}') for i in range(4)] == [None, None, '2', '3']
+    stats = store.stats()
+    assert (stats['expirations'], stats['evictions']) == (1, 2)
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    SqliteSessionStore(path).set('U1', 'lunch_rest')
+    assert SqliteSessionStore(path).get('U1') == 'lunch_rest'
+
+
+def test_create_session_store(tmp_path):
+    assert isinstance(create_session_store('memory'), MemorySessionStore)
+    store = create_session_store(f'sqlite:///{tmp_path}/sessions.db', ttl=5, maxsize=7, table='recommend_cursors')
+    assert (store.ttl, store.maxsize, store.table) == (5, 7, 'recommend_cursors')
+    with pytest.raises(ValueError):
+        create_session_store('redis://localhost')
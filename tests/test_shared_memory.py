@@ -0,0 +1,115 @@
+import gc
+import json
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+import metrics
+from conftest import write_rest_csvs
+
+# 模擬 gunicorn preload: master 載入餐廳資料、gc.freeze() 後 fork 出 worker，
+# 每個 worker 的 PSS 應該只多出自己的少量私有記憶體，不會各自複製一份資料
+WORKER_COUNTS = (1, 2, 4)
+SEARCH_QUERIES = ('牛肉麵', '湯頭', '北區', '好吃')
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith('linux') or not os.path.exists('/proc/self/smaps_rollup'),
+    reason='PSS 只能從 Linux 的 /proc/self/smaps_rollup 取得',
+)
+
+
+def serve_in_worker(data, report):
+    # 像 worker 處理 request 一樣讀資料，再回報自己的記憶體
+    for query in SEARCH_QUERIES:
+        data.search.search(query, k=5)
+    for sections in data.index.values():
+        for rests in sections.values():
+            rests[0].name
+    os.write(report, json.dumps(metrics.process_memory()).encode('utf-8'))
+    os.close(report)
+
+
+def fork_workers(data, count):
+    """fork count 個 worker，全部都還活著時收集各自的 process_memory()，回傳 (master, [worker, ...])。"""
+    pids, reports = [], []
+    release_read, release_write = os.pipe()
+    for _ in range(count):
+        report_read, report_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                os.close(report_read)
+                os.close(release_write)
+                serve_in_worker(data, report_write)
+                os.read(release_read, 1)  # 等 master 量完才結束，PSS 才是所有 worker 同時分攤的結果
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        os.close(report_write)
+        pids.append(pid)
+        reports.append(report_read)
+    os.close(release_read)
+
+    workers = []
+    for report in reports:
+        chunks = []
+        while chunk := os.read(report, 4096):
+            chunks.append(chunk)
+        os.close(report)
+        workers.append(json.loads(b''.join(chunks)))
+    master = metrics.process_memory()
+    os.close(release_write)
+    for pid in pids:
+        _, status = os.waitpid(pid, 0)
+        assert status == 0
+    return master, workers
+
+
+def measure_preloaded_workers(directory, result):
+    # 在乾淨的 process 裡執行 (multiprocessing spawn)，fork 時不會帶著 pytest 的 thread
+    from data_loader import RestDataLoader
+    from rest_index import REST_FILES
+
+    before = metrics.process_memory()
+    rest_files = {meal: os.path.join(directory, path) for meal, path in REST_FILES.items()}
+    loader = RestDataLoader(rest_files, os.path.join(directory, 'missing_coords.csv'), interval=0)
+    data = loader.load()
+    gc.freeze()
+    loaded = metrics.process_memory()
+    result.put({
+        'data_bytes': loaded['rss_bytes'] - before['rss_bytes'],
+        'runs': {count: fork_workers(data, count) for count in WORKER_COUNTS},
+    })
+
+
+def test_pss_per_added_worker_stays_flat(tmp_path):
+    write_rest_csvs(str(tmp_path), per_district=3000)
+    context = multiprocessing.get_context('spawn')
+    result = context.Queue()
+    process = context.Process(target=measure_preloaded_workers, args=(str(tmp_path), result))
+    process.start()
+    measured = result.get(timeout=120)
+    process.join(timeout=30)
+    assert process.exitcode == 0
+
+    data_bytes = measured['data_bytes']
+    runs = measured['runs']
+    assert data_bytes > 20 * 1024 * 1024  # 資料要夠大，共用與否的差別才量得出來
+
+    def total_pss(count):
+        master, workers = runs[count]
+        return master['pss_bytes'] + sum(worker['pss_bytes'] for worker in workers)
+
+    # 每多一個 worker，整體 PSS 只增加 worker 自己的私有部分，遠小於一份資料
+    per_added_worker = (total_pss(WORKER_COUNTS[-1]) - total_pss(WORKER_COUNTS[0])) / (WORKER_COUNTS[-1] - WORKER_COUNTS[0])
+    assert per_added_worker < data_bytes * 0.25
+    for count in WORKER_COUNTS:
+        for worker in runs[count][1]:
+            assert worker['private_dirty_bytes'] < data_bytes * 0.25
+    # worker 越多，共用的資料分攤得越細，單一 worker 的 PSS 不會變大
+    mean_pss = [sum(w['pss_bytes'] for w in runs[count][1]) / count for count in WORKER_COUNTS]
+    assert all(later <= earlier * 1.1 for earlier, later in zip(mean_pss, mean_pss[1:]))